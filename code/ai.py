@@ -0,0 +1,149 @@
+from settings import *
+from tables import TABLES
+from time import perf_counter
+import gc
+
+WIN_VALUE = 100.0  # Search value of a battle the opponent has won (negated for a loss)
+
+class SearchTimeout(Exception):
+    """Raised inside the search when the per-move time budget runs out"""
+
+class ExpectimaxPolicy:
+    """
+    'hard' opponent: searches the battle tree instead of picking by type alone
+    Opponent nodes take the best attack; player nodes are chance nodes over every legal
+    action (4 attacks, heal, switch to any healthy creature), weighted towards the action
+    that hurts the opponent most. Iterative deepening stops at the time budget, and a
+    transposition table keyed on the compact battle state is shared across depths and turns.
+
+    A search state is a tuple (player healths, player index, opponent healths, opponent index);
+    creature ids and attacks never change during a battle, so they are read from the engine once.
+    """
+    def __init__(self, time_budget = AI_TIME_BUDGET, max_depth = 8, greed = 0.5, table_size = 200000):
+        """
+        - time_budget: seconds allowed per move (an unfinished first depth falls back to the hardest hitting attack)
+        - max_depth: deepest search in opponent moves
+        - greed: weight of the player's best reply against the average of all replies
+        - table_size: transposition table entries kept before it is cleared
+        """
+        self.time_budget = time_budget
+        self.max_depth = max_depth
+        self.greed = greed
+        self.table_size = table_size
+        self.table = {}
+        self.engine = None
+        self.deadline = float('inf')
+
+    def __call__(self, engine):
+        """Pick the attack id for the opponent's active creature"""
+        deadline = perf_counter() + self.time_budget  # The budget covers the whole call, table clearing included
+        self.prepare(engine)
+        state = (tuple(creature.health for creature in engine.player_team), engine.player_index,
+                 tuple(creature.health for creature in engine.opponent_team), engine.opponent_index)
+
+        # Iterative deepening: keep the best attack of the deepest finished search
+        best = self.hardest_hitting(state)
+        self.deadline = deadline
+        # A collection pause in the middle of the search would blow the budget, so it waits until after the move
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            for depth in range(1, self.max_depth + 1):
+                best = self.best_attack(state, depth)
+        except SearchTimeout:
+            pass
+        finally:
+            if gc_enabled:
+                gc.enable()
+        return best
+
+    def prepare(self, engine):
+        """Cache the static parts of a battle (ids, attacks, max health) the first time it is seen"""
+        if engine is self.engine:
+            return
+        self.engine = engine
+        self.table.clear()
+        self.player_ids = [creature.id for creature in engine.player_team]
+        self.player_max = [creature.max_health for creature in engine.player_team]
+        self.player_abilities = [creature.ability_ids for creature in engine.player_team]
+        self.opponent_ids = [creature.id for creature in engine.opponent_team]
+        self.opponent_max = [creature.max_health for creature in engine.opponent_team]
+        self.opponent_abilities = [creature.ability_ids for creature in engine.opponent_team]
+
+    def hardest_hitting(self, state):
+        """Attack doing the most damage to the player's active creature, for when no search depth finishes"""
+        player_id = self.player_ids[state[1]]
+        return max(self.opponent_abilities[state[3]], key = lambda attack: TABLES.damage[attack][player_id])
+
+    def best_attack(self, state, depth):
+        """Attack id with the highest search value at the given depth"""
+        opponent_index = state[3]
+        return max(self.opponent_abilities[opponent_index], key = lambda attack: self.after_opponent_attack(state, attack, depth))
+
+    def opponent_value(self, state, depth):
+        """Value of a state where the opponent is about to attack"""
+        key = (state, depth)
+        if key in self.table:
+            return self.table[key]
+        if perf_counter() > self.deadline:
+            raise SearchTimeout
+        if depth == 0:
+            value = self.evaluate(state)
+        else:
+            value = max(self.after_opponent_attack(state, attack, depth) for attack in self.opponent_abilities[state[3]])
+        if len(self.table) >= self.table_size:
+            self.table.clear()
+        self.table[key] = value
+        return value
+
+    def after_opponent_attack(self, state, attack, depth):
+        player_health, player_index, opponent_health, opponent_index = state
+        player_health = list(player_health)
+        player_health[player_index] = max(0, player_health[player_index] - TABLES.damage[attack][self.player_ids[player_index]])
+        if player_health[player_index] <= 0:
+            # Fainted creature is replaced by the first healthy one, like BattleEngine.player_turn
+            healthy = [index for index, health in enumerate(player_health) if health > 0]
+            if not healthy:
+                return WIN_VALUE
+            player_index = healthy[0]
+        return self.player_value((tuple(player_health), player_index, opponent_health, opponent_index), depth)
+
+    def player_value(self, state, depth):
+        """Chance node: the player's possible actions, leaning towards their best reply"""
+        if perf_counter() > self.deadline:
+            raise SearchTimeout
+        values = [self.after_player_action(state, action, data, depth) for action, data in self.player_actions(state)]
+        return self.greed * min(values) + (1 - self.greed) * sum(values) / len(values)
+
+    def player_actions(self, state):
+        player_health, player_index = state[0], state[1]
+        actions = [('attack', attack) for attack in self.player_abilities[player_index]]
+        if player_health[player_index] < self.player_max[player_index]:
+            actions.append(('heal', None))
+        actions.extend(('switch', index) for index, health in enumerate(player_health) if health > 0 and index != player_index)
+        return actions
+
+    def after_player_action(self, state, action, data, depth):
+        player_health, player_index, opponent_health, opponent_index = state
+        if action == 'attack':
+            opponent_health = list(opponent_health)
+            opponent_health[opponent_index] = max(0, opponent_health[opponent_index] - TABLES.damage[data][self.opponent_ids[opponent_index]])
+            opponent_health = tuple(opponent_health)
+            if opponent_health[opponent_index] <= 0:
+                # Next opponent comes in and the player acts again (or the player wins)
+                if opponent_index + 1 >= len(opponent_health):
+                    return -WIN_VALUE
+                return self.player_value((player_health, player_index, opponent_health, opponent_index + 1), depth)
+        elif action == 'heal':
+            player_health = list(player_health)
+            player_health[player_index] = min(self.player_max[player_index], player_health[player_index] + HEAL_AMOUNT)
+            player_health = tuple(player_health)
+        else:
+            player_index = data
+        return self.opponent_value((player_health, player_index, opponent_health, opponent_index), depth - 1)
+
+    def evaluate(self, state):
+        """Heuristic value for the opponent: its remaining health share minus the player's"""
+        player_health, _, opponent_health, _ = state
+        return (sum(health / maximum for health, maximum in zip(opponent_health, self.opponent_max)) -
+                sum(health / maximum for health, maximum in zip(player_health, self.player_max)))
@@ -0,0 +1,126 @@
+"""
+On-disk cache of the packed texture atlas
+The atlas pages are stored as raw display-format (BGRA) pixels in one file, after a manifest
+of every source image's size and mtime. At startup the file is memory-mapped and the pages are
+wrapped with pygame.image.frombuffer: nothing is decoded or copied, and several game instances
+on one machine share the same read-only pages. A stale or missing cache falls back to decoding
+the images (and writes a fresh cache). Build it ahead of time with:
+
+    python asset_cache.py
+"""
+from settings import *
+from atlas import TextureAtlas
+import struct
+import json
+import mmap
+import os
+
+MAGIC = b'ECAC'
+VERSION = 2
+HEADER = struct.Struct('<4sBI')  # magic, version, manifest length - the manifest JSON follows
+PAGE_ALIGN = 4096                # Pages start on memory page boundaries
+
+def base_dir():
+    return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def source_manifest(folders = IMAGE_FOLDERS + ('attacks',)):
+    """{path under images/: [size, mtime in ns]} of every source image"""
+    sources = {}
+    for folder in folders:
+        for folder_path, _, file_names in walk(join(base_dir(), 'images', folder)):
+            for file_name in file_names:
+                stat = os.stat(join(folder_path, file_name))
+                relative = os.path.relpath(join(folder_path, file_name), join(base_dir(), 'images'))
+                sources[relative.replace(os.sep, '/')] = [stat.st_size, stat.st_mtime_ns]
+    return sources
+
+def pixel_format():
+    """Raw pixel layout of cached pages: the display's own byte order where pygame can write it"""
+    try:
+        pygame.image.tostring(pygame.Surface((1, 1), pygame.SRCALPHA), 'BGRA')
+        return 'BGRA'
+    except ValueError:
+        return 'RGBA'  # pygame before 2.1.3
+
+def layout():
+    """
+    Settings the cached pages depend on besides the source images
+    Attack sheets are cached whole and cut into frames after loading, so ATTACK_SHEETS isn't one of them.
+    """
+    return {'format': pixel_format(), 'page_size': ATLAS_PAGE_SIZE}
+
+def save_atlas(atlas, path = ASSET_CACHE):
+    """Write an atlas's pages and index to the cache file (atomically, other instances may be reading it)"""
+    path = join(base_dir(), path)
+    fmt = pixel_format()
+    offset = 0
+    pages = []
+    for page in atlas.pages:
+        pages.append([offset, page.get_width(), page.get_height()])
+        offset += -(-page.get_width() * page.get_height() * 4 // PAGE_ALIGN) * PAGE_ALIGN
+    manifest = {'sources': source_manifest(), 'layout': layout(), 'pages': pages,
+                'images': [[list(key), page, list(rect)] for key, (page, rect) in atlas.rects.items()]}
+    manifest = json.dumps(manifest).encode()
+    data_start = -(-(HEADER.size + len(manifest)) // PAGE_ALIGN) * PAGE_ALIGN
+
+    os.makedirs(os.path.dirname(path), exist_ok = True)
+    temp_path = f'{path}.{os.getpid()}.tmp'
+    with open(temp_path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, VERSION, len(manifest)) + manifest)
+        for (page_offset, _, _), page in zip(pages, atlas.pages):
+            file.seek(data_start + page_offset)
+            file.write(pygame.image.tostring(page, fmt))
+    try:
+        os.replace(temp_path, path)
+    except OSError:
+        # Another instance still has the old cache mapped (Windows can't replace it), try next start
+        os.remove(temp_path)
+        return None
+    return path
+
+def load_atlas(path = ASSET_CACHE):
+    """TextureAtlas backed by the memory-mapped cache file, or None if it is missing or stale"""
+    path = join(base_dir(), path)
+    try:
+        with open(path, 'rb') as file:
+            buffer = mmap.mmap(file.fileno(), 0, access = mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+
+    try:
+        magic, version, manifest_size = HEADER.unpack_from(buffer)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError('not an asset cache (or an unsupported version)')
+        manifest = json.loads(buffer[HEADER.size:HEADER.size + manifest_size])
+        if manifest['layout'] != layout() or manifest['sources'] != source_manifest():
+            raise ValueError('asset cache is stale')
+
+        data_start = -(-(HEADER.size + manifest_size) // PAGE_ALIGN) * PAGE_ALIGN
+        atlas = TextureAtlas()
+        atlas.source = buffer  # Keeps the mapping open as long as the pages use it
+        for offset, width, height in manifest['pages']:
+            start = data_start + offset
+            pixels = memoryview(buffer)[start:start + width * height * 4]
+            atlas.pages.append(pygame.image.frombuffer(pixels, (width, height), manifest['layout']['format']))
+        for key, page, rect in manifest['images']:
+            atlas.rects[tuple(key)] = (page, pygame.Rect(rect))
+        return atlas
+    except (ValueError, KeyError, struct.error):
+        buffer.close()
+        return None
+
+if __name__ == '__main__':
+    from support import AssetLoader
+
+    # Pages are stored in the display's pixel format, so a (hidden) display is needed to convert them
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+
+    loader = AssetLoader()
+    for folder in IMAGE_FOLDERS:
+        loader.images(folder, 'images', folder)
+    loader.images('attacks', 'images', 'attacks')
+    atlas = TextureAtlas()
+    atlas.pack_groups(loader.load())
+    print(f'Cached {len(atlas.rects)} images on {len(atlas.pages)} pages in {save_atlas(atlas)}')
@@ -0,0 +1,140 @@
+"""
+Process-wide asset manager
+Images and sounds are loaded once and shared by every round: restarting the game hands
+back the same surfaces and sounds instead of decoding them again.
+Loading is staged: the portraits the creature selection screen needs come first, and the
+battle assets decode in the background while the player picks a team.
+"""
+from settings import *
+from support import AssetLoader, slice_sheets
+from atlas import TextureAtlas
+from asset_cache import load_atlas, save_atlas
+from render_cache import PortraitCache
+from collections import OrderedDict
+
+class SoundBank:
+    """
+    Sounds by name, least recently used first
+    Sounds not loaded yet, or evicted to stay under the memory budget, are loaded the next time they are asked for.
+    """
+    def __init__(self, paths, sounds = None):
+        """
+        - paths: {name: file path} of every sound, for loading on demand
+        - sounds: {name: pygame Sound} already loaded
+        """
+        self.sounds = OrderedDict(sounds or {})
+        self.paths = dict(paths)
+
+    def add(self, sounds):
+        """Take in sounds loaded elsewhere, keeping any already loaded on demand"""
+        for name, sound in sounds.items():
+            self.sounds.setdefault(name, sound)
+
+    def __contains__(self, name):
+        return name in self.paths
+
+    def __getitem__(self, name):
+        if name not in self.sounds:
+            self.sounds[name] = pygame.mixer.Sound(self.paths[name])
+        self.sounds.move_to_end(name)
+        return self.sounds[name]
+
+    def memory(self):
+        """Bytes of decoded sample data held"""
+        frequency, size, channels = pygame.mixer.get_init() or (0, 0, 0)
+        bytes_per_second = frequency * channels * abs(size) // 8
+        return int(sum(sound.get_length() * bytes_per_second for sound in self.sounds.values()))
+
+    def evict(self, budget):
+        """Drop least recently used sounds that aren't playing until the bank fits in `budget` bytes"""
+        for name in list(self.sounds):
+            if self.memory() <= budget:
+                break
+            if self.sounds[name].get_num_channels() == 0:
+                del self.sounds[name]
+
+class AssetManager:
+    """
+    Owns every image and sound for the life of the process
+    load_selection() loads what the creature selection screen needs and starts decoding the
+    rest in the background; load() collects the rest, waiting only for files still decoding.
+    Later calls return immediately with the same shared objects. Callers must not draw on
+    the shared surfaces.
+    """
+    def __init__(self, memory_budget = ASSET_MEMORY_BUDGET):
+        """
+        - memory_budget: bytes of sound data kept between rounds (None = keep everything)
+        """
+        self.memory_budget = memory_budget
+        self.loader = None  # Background loader of the battle assets, once selection assets are in
+        self.loaded = False
+
+    def load_selection(self, progress = None):
+        """
+        Stage one: creature portraits for the selection screen, then start the battle assets decoding
+        - progress: called as progress(done, total) while files are decoded
+        """
+        if self.loader is not None or self.loaded:
+            return self
+
+        # Images come packed in atlas pages, memory-mapped from the asset cache when it is up to date
+        self.atlas = load_atlas() if ASSET_CACHE is not None else None
+        self.cached = self.atlas is not None
+        if self.cached:
+            self.simple_surfs = self.atlas.grouped()['simple']
+        else:
+            loader = AssetLoader()
+            loader.images('simple', 'images', 'simple')
+            self.atlas = TextureAtlas()
+            self.simple_surfs = self.atlas.pack_groups(loader.load(progress = progress))['simple']
+        self.portraits = PortraitCache(self.simple_surfs)  # Scaled portraits, warmed by the screens that draw them
+
+        # Everything else decodes on the loader's thread pool while the player picks a team
+        self.loader = AssetLoader()
+        if not self.cached:
+            for folder in self.battle_folders():
+                self.loader.images(folder, 'images', folder)
+        self.loader.sounds('audio', 'audio')
+        self.audio = SoundBank(self.loader.files.get('audio', {}))  # Sounds asked for early load on demand
+        self.loader.start()
+        return self
+
+    def battle_folders(self):
+        """Image folders loaded in the background: attack sheets are loaded whole and cut into frames once packed"""
+        return tuple(folder for folder in IMAGE_FOLDERS if folder != 'simple') + ('attacks',)
+
+    def ready(self):
+        """Whether load() can finish without waiting on files still decoding"""
+        return self.loaded or (self.loader is not None and self.loader.finished())
+
+    def load(self, progress = None):
+        """
+        Load everything, the first time it is called
+        - progress: called as progress(done, total) while files are decoded
+        """
+        if self.loaded:
+            return self
+        self.load_selection(progress = progress)
+        assets = self.loader.load(progress = progress)
+
+        if not self.cached:
+            # Every image is packed into a few atlas pages and used through subsurfaces of them
+            images = self.atlas.pack_groups({group: assets[group] for group in self.battle_folders()})
+            if ASSET_CACHE is not None and not self.atlas.unpacked:
+                save_atlas(self.atlas)  # The next start skips decoding
+        else:
+            images = self.atlas.grouped()
+        self.back_surfs = images['back']
+        self.front_surfs = images['front']
+        self.bg_surfs = images['other']
+        self.attack_frames = slice_sheets(images['attacks'])  # Frames are views into the packed sheets
+        self.audio.add(assets['audio'])
+        self.loaded = True
+        return self
+
+    def trim(self):
+        """Evict unused sounds past the memory budget (call between rounds)"""
+        if self.loaded and self.memory_budget is not None:
+            self.audio.evict(self.memory_budget)
+
+ASSETS = AssetManager()  # Shared by every Game in the process
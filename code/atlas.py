@@ -0,0 +1,98 @@
+"""
+Texture atlas
+Loaded images are packed into a few large pages and handed back as subsurfaces, so every
+sprite, portrait and attack frame shares a handful of pixel buffers instead of one each.
+"""
+from settings import *
+
+class TextureAtlas:
+    """
+    Shelf packer: images are sorted tallest first and placed left to right on shelves,
+    a new shelf starting under the last one and a new page when a page is full.
+    Images bigger than a page are kept as they are.
+    """
+    def __init__(self, page_size = ATLAS_PAGE_SIZE, padding = 1):
+        """
+        - page_size: width and height of a page in pixels
+        - padding: empty pixels between images, so smoothscaled portraits don't bleed into neighbours
+        """
+        self.page_size = page_size
+        self.padding = padding
+        self.pages = []  # Page surfaces
+        self.rects = {}  # name -> (page index, Rect) of every packed image
+        self.unpacked = []  # Names of images too big for a page, kept as separate surfaces
+
+    def place(self, size, shelves):
+        """Find a spot for an image of `size`, opening shelves and pages as needed; returns (page, x, y)"""
+        width, height = size[0] + self.padding, size[1] + self.padding
+        for page, page_shelves in enumerate(shelves):
+            # page_shelves: [y, height, next free x] per shelf
+            for shelf in page_shelves:
+                if height <= shelf[1] and shelf[2] + width <= self.page_size:
+                    shelf[2] += width
+                    return page, shelf[2] - width, shelf[0]
+            top = page_shelves[-1][0] + page_shelves[-1][1] if page_shelves else 0
+            if top + height <= self.page_size:
+                page_shelves.append([top, height, width])
+                return page, 0, top
+        shelves.append([[0, height, width]])
+        return len(shelves) - 1, 0, 0
+
+    def pack(self, surfaces):
+        """Pack a {name: surface} dict onto new pages and return {name: subsurface of a page}"""
+        shelves = []  # Per new page
+        placed = {}
+        for name, surf in sorted(surfaces.items(), key = lambda item: item[1].get_height(), reverse = True):
+            if surf.get_width() <= self.page_size and surf.get_height() <= self.page_size:
+                page, x, y = self.place(surf.get_size(), shelves)
+                placed[name] = (len(self.pages) + page, pygame.Rect((x, y), surf.get_size()))
+
+        # Pages are only as tall as their shelves
+        for page_shelves in shelves:
+            height = page_shelves[-1][0] + page_shelves[-1][1]
+            page = pygame.Surface((self.page_size, height), pygame.SRCALPHA)
+            self.pages.append(page.convert_alpha() if pygame.display.get_surface() else page)
+
+        images = {}
+        for name, surf in surfaces.items():
+            if name not in placed:
+                self.unpacked.append(name)
+                images[name] = surf
+                continue
+            page, rect = placed[name]
+            # Max blending onto the cleared page copies the pixels, alpha included, without blending them
+            self.pages[page].blit(surf, rect, special_flags = pygame.BLEND_RGBA_MAX)
+            self.rects[name] = (page, rect)
+            images[name] = self.pages[page].subsurface(rect)
+        return images
+
+    def pack_groups(self, groups):
+        """
+        Pack several image dicts in one go (better packing than one at a time)
+        - groups: {group: {name: surface or list of frames}}, shaped like the importers in support.py
+        Returns the same shape with every surface replaced by its subsurface
+        """
+        flat = {}
+        for group, surfaces in groups.items():
+            for name, value in surfaces.items():
+                if isinstance(value, list):
+                    flat.update(((group, name, index), frame) for index, frame in enumerate(value))
+                else:
+                    flat[(group, name)] = value
+        packed = self.pack(flat)
+        return {group: {name: [packed[(group, name, index)] for index in range(len(value))] if isinstance(value, list) else packed[(group, name)]
+                        for name, value in surfaces.items()} for group, surfaces in groups.items()}
+
+    def grouped(self):
+        """Every packed image as {group: {name: subsurface or list of frames}}, like pack_groups returns"""
+        groups = {}
+        frames = {}
+        for key, (page, rect) in self.rects.items():
+            surf = self.pages[page].subsurface(rect)
+            if len(key) == 3:
+                frames.setdefault(key[:2], {})[key[2]] = surf
+            else:
+                groups.setdefault(key[0], {})[key[1]] = surf
+        for (group, name), by_index in frames.items():
+            groups.setdefault(group, {})[name] = [by_index[index] for index in sorted(by_index)]
+        return groups
@@ -1,14 +1,15 @@
 from settings import * 
 
 class AttackAnimationSprite(pygame.sprite.Sprite):
-    def __init__(self, target, frames, groups):
+    def __init__(self, target, frames, groups, frame_duration = ATTACK_SHEET_DEFAULT['frame_duration']):
         super().__init__(groups)
         self.frames, self.frame_index = frames, 0
+        self.frame_duration = frame_duration  # Seconds per frame
         self.image = self.frames[self.frame_index]
         self.rect = self.image.get_rect(center = target.rect.center)
     
     def update(self, dt):
-        self.frame_index += 5 * dt
+        self.frame_index += dt / self.frame_duration
         if self.frame_index < len(self.frames):
             self.image = self.frames[int(self.frame_index)]
         else:
@@ -0,0 +1,399 @@
+from settings import *
+from tables import TABLES, SUPER_EFFECTIVE, HIGH_DAMAGE
+from functools import lru_cache
+from array import array
+import random
+import struct
+
+# Battle states in the order used by replays and snapshots
+STATES = ['playing', 'win', 'lose', 'escape']
+
+# Snapshot layout: magic, version, seed, has seed, player team size, opponent team size, player index,
+# opponent index, player active, state, action count - followed by each team (creature ids, uint16 attack set ids,
+# health doubles), the random stream (625 uint32 words, gauss_next double) and the recorded actions
+SNAPSHOT_MAGIC = b'ECBS'
+SNAPSHOT_VERSION = 2  # 2: attack set ids take 2 bytes (C(n, 4) passes 255 at 11 attacks)
+SNAPSHOT_HEADER = struct.Struct('<4sBQBBBBBBBI')
+RNG_WORDS = 625
+
+class TeamState:
+    """
+    Struct-of-arrays store for a team's battle state
+    One flat buffer per stat (indexed by team slot). Only health changes during a battle, so
+    copying a team for AI lookahead or a snapshot is a single buffer copy; the rest is shared
+    """
+    __slots__ = ('creature_ids', 'element_ids', 'ability_sets', 'max_health', 'health')
+
+    def __init__(self, names = (), rng = random):
+        """
+        - names: creature names in team order
+        - rng: random source used to roll each creature's attack set
+        """
+        creature_ids = [TABLES.creature_ids[name] for name in names]
+        self.creature_ids = bytes(creature_ids)
+        self.element_ids = bytes(TABLES.creature_element[creature_id] for creature_id in creature_ids)
+        # Randomly choose 4 attacks from all available attacks for each creature (as a set id, see tables.py)
+        self.ability_sets = array('H', [rng.randrange(len(TABLES.ability_sets)) for _ in creature_ids])
+        self.max_health = array('d', [TABLES.creature_health[creature_id] for creature_id in creature_ids])
+        self.health = array('d', self.max_health)
+
+    def __len__(self):
+        return len(self.creature_ids)
+
+    def copy(self):
+        """Independent copy of the team state (shares the read-only buffers)"""
+        team = TeamState.__new__(TeamState)
+        team.creature_ids = self.creature_ids
+        team.element_ids = self.element_ids
+        team.ability_sets = self.ability_sets
+        team.max_health = self.max_health
+        team.health = self.health[:]
+        return team
+
+    def to_bytes(self):
+        """Creature ids, attack set ids and health as one buffer (max health and elements follow from the ids)"""
+        return self.creature_ids + self.ability_sets.tobytes() + self.health.tobytes()
+
+    @classmethod
+    def from_buffer(cls, data, offset, size):
+        """Rebuild a team of `size` creatures from to_bytes data starting at offset; returns (team, end offset)"""
+        team = cls.__new__(cls)
+        team.creature_ids = bytes(data[offset:offset + size])
+        team.ability_sets = array('H')
+        team.ability_sets.frombytes(data[offset + size:offset + 3 * size])
+        team.element_ids = bytes(TABLES.creature_element[creature_id] for creature_id in team.creature_ids)
+        team.max_health = array('d', [TABLES.creature_health[creature_id] for creature_id in team.creature_ids])
+        team.health = array('d')
+        team.health.frombytes(data[offset + 3 * size:offset + 11 * size])
+        return team, offset + 11 * size
+
+    def creatures(self):
+        """Creature views for every slot of the team"""
+        return [Creature(self, slot) for slot in range(len(self))]
+
+class Creature:
+    """
+    Battle state of a single creature - element, health and available attacks
+    A light view of one slot in a TeamState, so it works both in the game and in headless simulations
+    """
+    __slots__ = ('team', 'slot')
+
+    def __init__(self, team, slot):
+        self.team = team  # TeamState holding the data
+        self.slot = slot  # Position in the team
+
+    @property
+    def id(self):
+        """Creature id into the compiled tables (see tables.py)"""
+        return self.team.creature_ids[self.slot]
+
+    @property
+    def name(self):
+        return TABLES.creature_names[self.team.creature_ids[self.slot]]
+
+    @property
+    def element_id(self):
+        return self.team.element_ids[self.slot]
+
+    @property
+    def element(self):
+        return TABLES.element_names[self.team.element_ids[self.slot]]
+
+    @property
+    def max_health(self):
+        return self.team.max_health[self.slot]
+
+    @property
+    def health(self):
+        """Get current health points"""
+        return self.team.health[self.slot]
+
+    @health.setter
+    def health(self, value):
+        """
+        Set health with bounds checking
+        Health cannot go below 0 or above max_health
+        """
+        self.team.health[self.slot] = min(self.team.max_health[self.slot], max(0, value))
+
+    @property
+    def ability_ids(self):
+        """Sorted tuple of the creature's 4 attack ids (shared, no allocation)"""
+        return TABLES.ability_sets[self.team.ability_sets[self.slot]]
+
+    @property
+    def abilities(self):
+        """Names of the creature's 4 attacks, in the same order as ability_ids"""
+        return TABLES.ability_set_names[self.team.ability_sets[self.slot]]
+
+    def __repr__(self):
+        """String representation showing name and health status"""
+        return f'{self.name}: {self.health:.0f}/{self.max_health:.0f}'
+
+def build_gauntlet(selected_creatures, rng = random, size = OPPONENT_TEAM_SIZE):
+    """
+    Pick the opponent creature names the player has to beat
+    - selected_creatures: names chosen by the player (avoided where possible)
+    """
+    # Create opponent team - random creatures (excluding player's creatures to avoid duplicates)
+    available_opponents = [name for name in CREATURE_DATA.keys() if name not in selected_creatures]
+    if len(available_opponents) < size:
+        # If not enough unique creatures, allow duplicates
+        available_opponents = list(CREATURE_DATA.keys())
+
+    gauntlet = []
+    for i in range(size):
+        opponent_name = rng.choice(available_opponents)
+        gauntlet.append(opponent_name)
+        # Remove from available to avoid immediate duplicates (but could repeat if needed)
+        available_opponents.remove(opponent_name)
+        if not available_opponents:  # If we run out, refill
+            available_opponents = list(CREATURE_DATA.keys())
+    return gauntlet
+
+@lru_cache(maxsize = AI_CACHE_SIZE)
+def categorize_attacks(ability_set, target_element_id):
+    """
+    Split an ability set into (super effective, high damage, normal) attack id tuples
+    Only depends on the matchup, so results are memoized (categorize_attacks.cache_info() has the hit counts)
+    - ability_set: sorted tuple of attack ids (Creature.ability_ids)
+    - target_element_id: element id of the creature being attacked
+    """
+    # Categorize attacks by effectiveness and damage
+    super_effective_attacks = []
+    high_damage_attacks = []
+    normal_attacks = []
+
+    for attack in ability_set:
+        category = TABLES.attack_category[attack][target_element_id]
+        if category == SUPER_EFFECTIVE:
+            super_effective_attacks.append(attack)
+        elif category == HIGH_DAMAGE:  # High damage attacks
+            high_damage_attacks.append(attack)
+        else:
+            normal_attacks.append(attack)
+    return tuple(super_effective_attacks), tuple(high_damage_attacks), tuple(normal_attacks)
+
+def warm_attack_cache(creatures):
+    """Categorize every creature's attacks against every element up front (e.g. when a team is built)"""
+    for creature in creatures:
+        for element_id in range(len(TABLES.element_names)):
+            categorize_attacks(creature.ability_ids, element_id)
+
+def choose_smart_attack(ability_set, target_element_id, rng = random):
+    """
+    AI chooses attacks more strategically based on type effectiveness and damage
+    - ability_set: sorted tuple of attack ids the creature can use (Creature.ability_ids)
+    - target_element_id: element id of the creature being attacked
+    Returns the chosen attack id
+    """
+    super_effective_attacks, high_damage_attacks, normal_attacks = categorize_attacks(ability_set, target_element_id)
+
+    # DIFFICULTY: Smarter attack selection
+    # 60% chance for super effective, 30% for high damage, 10% for normal
+    rand = rng.random()
+    if super_effective_attacks and rand < 0.6:
+        return rng.choice(super_effective_attacks)
+    elif high_damage_attacks and rand < 0.9:
+        return rng.choice(high_damage_attacks)
+    elif normal_attacks:
+        return rng.choice(normal_attacks)
+    else:
+        # Fallback to any attack
+        return rng.choice(ability_set)
+
+# One byte per player action in replays (see replay.py)
+ACTION_HEAL = 4       # 0-3 are attack slots
+ACTION_SWITCH = 5     # 5 + player team index
+ACTION_ESCAPE = 255
+
+def encode_action(creature, action, data = None):
+    """Byte code of a player action taken with the given active creature"""
+    if action == 'attack':
+        return creature.ability_ids.index(data)
+    elif action == 'heal':
+        return ACTION_HEAL
+    elif action == 'switch':
+        return ACTION_SWITCH + data
+    return ACTION_ESCAPE
+
+def decode_action(creature, code):
+    """(action, data) for a byte code from encode_action"""
+    if code < ACTION_HEAL:
+        return 'attack', creature.ability_ids[code]
+    elif code == ACTION_HEAL:
+        return 'heal', None
+    elif code == ACTION_ESCAPE:
+        return 'escape', None
+    return 'switch', code - ACTION_SWITCH
+
+def smart_policy(engine):
+    """Default opponent policy: choose_smart_attack against the player's active creature"""
+    return choose_smart_attack(engine.opponent.ability_ids, engine.monster.element_id, engine.rng)
+
+class BattleEngine:
+    """
+    Headless battle rules - holds both teams, the active creatures and whose turn it is
+    Every call resolves instantly; the pygame Game decides when and how to show the result
+    """
+    def __init__(self, player_names, opponent_names = None, seed = None, rng = None, opponent_policy = smart_policy):
+        """
+        - player_names: names of the creatures the player picked
+        - opponent_names: gauntlet to fight (built with build_gauntlet when not given)
+        - seed: seed of the battle's own random stream (a random 64 bit seed when not given)
+        - rng: random source to use instead of a seeded stream (the battle then can't be replayed)
+        - opponent_policy: function(engine) -> attack id the opponent uses (see ai.py for a search based one)
+        """
+        # Every random decision (gauntlet, attacks, AI) comes from this one stream
+        if rng is None:
+            if seed is None:
+                seed = random.getrandbits(64)
+            rng = random.Random(seed)
+        self.seed = seed
+        self.rng = rng
+        self.opponent_policy = opponent_policy
+        self.actions = bytearray()  # Player actions so far, one byte each (see encode_action)
+        if opponent_names is None:
+            opponent_names = build_gauntlet(player_names, rng)
+        self.players = TeamState(player_names, rng)
+        self.opponents = TeamState(opponent_names, rng)
+        self.player_team = self.players.creatures()
+        self.opponent_team = self.opponents.creatures()
+        self.player_index = 0    # Active player creature
+        self.opponent_index = 0  # Active opponent creature
+        self.player_active = True
+        self.state = 'playing'   # Can be: 'playing', 'win', 'lose', 'escape'
+
+    @property
+    def monster(self):
+        """Player's active creature"""
+        return self.player_team[self.player_index]
+
+    @property
+    def opponent(self):
+        """Opponent's active creature"""
+        return self.opponent_team[self.opponent_index]
+
+    def apply_attack(self, target, attack):
+        """
+        Apply damage from one Creature to another and return the damage dealt
+        - target: Creature receiving the attack
+        - attack: id of the attack being used
+        """
+        # Damage = base damage × type effectiveness, precompiled per (attack, target creature)
+        team, slot = target.team, target.slot
+        damage = TABLES.damage[attack][team.creature_ids[slot]]
+        team.health[slot] = max(0.0, team.health[slot] - damage)
+        return damage
+
+    def player_action(self, action, data = None):
+        """
+        Resolve the player's choice for this turn
+        - action: 'attack', 'heal', 'switch' or 'escape'
+        - data: attack id for 'attack', player team index for 'switch'
+        """
+        self.actions.append(encode_action(self.monster, action, data))
+        if action == 'attack':
+            self.apply_attack(self.opponent, data)
+        elif action == 'heal':
+            self.monster.health += HEAL_AMOUNT
+        elif action == 'switch':
+            self.player_index = data
+        elif action == 'escape':
+            self.state = 'escape'
+        self.player_active = False
+
+    def opponent_turn(self):
+        """
+        Let the opponent act - returns the attack id it used, or None if it fainted instead
+        A fainted opponent is replaced by the next one in the gauntlet (or the player wins)
+        """
+        if self.opponent.health <= 0:
+            if self.opponent_index + 1 < len(self.opponent_team):
+                # Move to next opponent creature
+                self.opponent_index += 1
+                self.player_active = True
+            else:
+                # Player wins - defeated all opponent creatures
+                self.state = 'win'
+                self.player_active = False
+            return None
+
+        attack = self.opponent_policy(self)
+        self.apply_attack(self.monster, attack)
+        return attack
+
+    def player_turn(self):
+        """Give control back to the player, sending in the next creature if the active one fainted"""
+        self.player_active = True
+        if self.monster.health <= 0:
+            available = [index for index, creature in enumerate(self.player_team) if creature.health > 0]
+            if available:
+                self.player_index = available[0]
+            else:
+                # Player loses - all monsters defeated
+                self.state = 'lose'
+                self.player_active = False
+
+    def snapshot(self):
+        """
+        Full battle state (teams, active creatures, turn, random stream, actions) as fixed-layout bytes
+        The opponent policy is not included; pass it again to from_snapshot
+        """
+        _, words, gauss_next = self.rng.getstate()
+        header = SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, self.seed or 0, self.seed is not None,
+                                      len(self.players), len(self.opponents), self.player_index, self.opponent_index,
+                                      self.player_active, STATES.index(self.state), len(self.actions))
+        rng_state = array('I', words).tobytes() + struct.pack('<d', float('nan') if gauss_next is None else gauss_next)
+        return b''.join((header, self.players.to_bytes(), self.opponents.to_bytes(), rng_state, self.actions))
+
+    @classmethod
+    def from_snapshot(cls, data, opponent_policy = smart_policy):
+        """Rebuild a BattleEngine from snapshot bytes"""
+        (magic, version, seed, has_seed, player_size, opponent_size, player_index, opponent_index,
+         player_active, state, action_count) = SNAPSHOT_HEADER.unpack_from(data)
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+            raise ValueError('not a battle snapshot (or an unsupported version)')
+
+        engine = cls.__new__(cls)
+        engine.players, offset = TeamState.from_buffer(data, SNAPSHOT_HEADER.size, player_size)
+        engine.opponents, offset = TeamState.from_buffer(data, offset, opponent_size)
+        engine.player_team = engine.players.creatures()
+        engine.opponent_team = engine.opponents.creatures()
+
+        words = array('I')
+        words.frombytes(data[offset:offset + 4 * RNG_WORDS])
+        offset += 4 * RNG_WORDS
+        gauss_next = struct.unpack_from('<d', data, offset)[0]
+        offset += 8
+        engine.rng = random.Random()
+        engine.rng.setstate((3, tuple(words), None if gauss_next != gauss_next else gauss_next))  # NaN marks None
+
+        engine.seed = seed if has_seed else None
+        engine.opponent_policy = opponent_policy
+        engine.actions = bytearray(data[offset:offset + action_count])
+        engine.player_index = player_index
+        engine.opponent_index = opponent_index
+        engine.player_active = bool(player_active)
+        engine.state = STATES[state]
+        return engine
+
+    def play_turn(self, action, data = None):
+        """Resolve a full round: the player's action, the opponent's reply and the hand-back"""
+        self.player_action(action, data)
+        if self.state != 'playing':
+            return
+        if self.opponent_turn() is not None:
+            self.player_turn()
+
+    def run(self, player_policy = None):
+        """
+        Play the battle to the end and return the final state ('win' or 'lose')
+        - player_policy: function(engine) -> (action, data); attacks like the AI when not given
+        """
+        while self.state == 'playing':
+            if player_policy is None:
+                self.play_turn('attack', choose_smart_attack(self.monster.ability_ids, self.opponent.element_id, self.rng))
+            else:
+                self.play_turn(*player_policy(self))
+        return self.state
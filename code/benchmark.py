@@ -0,0 +1,201 @@
+"""
+Offline benchmark suite - runs with SDL's dummy video and audio drivers, no window needed
+
+    python benchmark.py --output bench.json
+    python benchmark.py --output new.json --baseline bench.json   # exit code 1 on regressions
+
+Measures battle rule throughput, frame time for each game state, asset import time,
+restart time and cold start to first frame. Every number is the median of several repeats.
+Also checks that the dirty-rect renderer's frames match a full redraw (exit code 1 if not).
+"""
+import os
+import sys
+
+# Must be set before pygame initializes its display and mixer
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+from settings import *
+from battle import BattleEngine
+from renderer import DirtyRenderer
+from attack import AttackAnimationSprite
+from assets import AssetManager
+from statistics import median
+from time import perf_counter
+import subprocess
+import platform
+import json
+import time
+
+def bench_turns(battles = 2000, repeats = 5):
+    """Player turns per second through the headless battle rules"""
+    team = list(CREATURE_DATA.keys())[:TEAM_SIZE]
+    rates = []
+    for repeat in range(repeats):
+        start = perf_counter()
+        turns = 0
+        for seed in range(battles):
+            engine = BattleEngine(team, seed = seed)
+            engine.run()
+            turns += len(engine.actions)
+        rates.append(turns / (perf_counter() - start))
+    return median(rates)
+
+def bench_frames(game, frames = 200, warmup = 20):
+    """Median and 99th percentile frame time (ms) of the game's current state"""
+    for _ in range(warmup):
+        game.frame(1 / 60)
+    times = []
+    for _ in range(frames):
+        start = perf_counter()
+        game.frame(1 / 60)
+        times.append((perf_counter() - start) * 1000)
+    times.sort()
+    return median(times), times[min(len(times) - 1, int(len(times) * 0.99))]
+
+def bench_import_assets(repeats = 5):
+    """Median time (ms) to load every asset into a fresh AssetManager"""
+    times = []
+    for _ in range(repeats):
+        start = perf_counter()
+        AssetManager().load()
+        times.append((perf_counter() - start) * 1000)
+    return median(times)
+
+def bench_restart(game, repeats = 5):
+    """Median time (ms) of Game.restart_game, which reuses the loaded assets"""
+    times = []
+    for _ in range(repeats):
+        start = perf_counter()
+        game.restart_game()
+        times.append((perf_counter() - start) * 1000)
+    return median(times)
+
+def check_dirty_frames(game, frames = 250):
+    """
+    Play the battle with the dirty-rect renderer, attacking whenever the player may, and compare
+    every frame against a full draw_battle() - returns the number of frames that differed
+    """
+    game.renderer = DirtyRenderer(game.display_surface, game.bg_surfs['bg'])
+    mismatches = 0
+    for _ in range(frames):
+        if game.game_state != 'playing':
+            break
+        if game.player_active and not any(isinstance(sprite, AttackAnimationSprite) for sprite in game.all_sprites):
+            game.get_input('attack', game.monster.abilities[0])
+        pulse_timer = game.ui.pulse_timer
+        game.frame(1 / 60)
+        dirty = pygame.image.tostring(game.display_surface, 'RGB')
+        drawn_pulse_timer, game.ui.pulse_timer = game.ui.pulse_timer, pulse_timer  # Menu glow draws the same frame again
+        game.draw_battle()
+        game.ui.pulse_timer = drawn_pulse_timer
+        if pygame.image.tostring(game.display_surface, 'RGB') != dirty:
+            mismatches += 1
+            game.renderer.invalidate()
+    game.renderer = None
+    return mismatches
+
+def bench_cold_start(repeats = 3):
+    """Median wall time (ms) from launching a fresh interpreter to the first drawn frame"""
+    times = []
+    for _ in range(repeats):
+        start = time.time()
+        output = subprocess.run([sys.executable, __file__, '--first-frame'], capture_output = True, text = True, check = True,
+                                cwd = os.path.dirname(os.path.abspath(__file__))).stdout
+        times.append((float(output.split()[-1]) - start) * 1000)
+    return median(times)
+
+def first_frame():
+    """Child process for bench_cold_start: start the game, draw one frame, print the wall clock"""
+    from main import Game
+    game = Game()
+    game.frame(0)
+    print(time.time())
+    pygame.quit()
+
+def run_benchmarks(quick = False):
+    """
+    Run every benchmark and return ({name: {'value', 'unit', 'higher_is_better'}}, dirty-rect frames
+    that didn't match a full redraw)
+    """
+    from main import Game
+
+    scale = 0.2 if quick else 1
+    metrics = {}
+
+    def record(name, value, unit, higher_is_better = False):
+        metrics[name] = {'value': round(value, 4), 'unit': unit, 'higher_is_better': higher_is_better}
+        print(f'{name:<28}{value:>12.3f} {unit}')
+
+    record('battle_turns_per_second', bench_turns(int(2000 * scale)), 'turns/s', True)
+
+    game = Game()
+    frames = int(200 * scale)
+    record('selection_frame_ms', bench_frames(game, frames)[0], 'ms')
+    game.initialize_battle(list(CREATURE_DATA.keys())[:TEAM_SIZE])
+    playing, playing_p99 = bench_frames(game, frames)
+    record('playing_frame_ms', playing, 'ms')
+    record('playing_frame_p99_ms', playing_p99, 'ms')
+    game.renderer = DirtyRenderer(game.display_surface, game.bg_surfs['bg'])
+    record('playing_dirty_frame_ms', bench_frames(game, frames)[0], 'ms')
+    game.renderer = None
+    for state in ('win', 'lose'):
+        game.game_state = state
+        game.end_screen = None
+        record(f'{state}_frame_ms', bench_frames(game, frames)[0], 'ms')
+    record('import_assets_ms', bench_import_assets(2 if quick else 5), 'ms')
+    game.restart_game()
+    game.initialize_battle(list(CREATURE_DATA.keys())[:TEAM_SIZE])
+    mismatches = check_dirty_frames(game, int(250 * scale))
+    print(f'{"dirty_rect_mismatches":<28}{mismatches:>12} frames')
+    record('restart_ms', bench_restart(game, 2 if quick else 5), 'ms')
+    pygame.quit()
+
+    record('cold_start_ms', bench_cold_start(1 if quick else 3), 'ms')
+    return metrics, mismatches
+
+def compare(metrics, baseline, threshold):
+    """Print the change against a baseline and return the names of metrics that regressed"""
+    regressions = []
+    print(f'\n{"metric":<28}{"baseline":>12}{"current":>12}{"change":>10}')
+    for name, metric in metrics.items():
+        if name not in baseline:
+            continue
+        old, new = baseline[name]['value'], metric['value']
+        change = (new - old) / old if old else 0.0
+        worse = -change if metric['higher_is_better'] else change
+        flag = '  REGRESSION' if worse > threshold else ''
+        if flag:
+            regressions.append(name)
+        print(f'{name:<28}{old:>12.3f}{new:>12.3f}{change:>+10.1%}{flag}')
+    return regressions
+
+if __name__ == '__main__':
+    import argparse
+
+    if '--first-frame' in sys.argv:
+        first_frame()
+        sys.exit(0)
+
+    parser = argparse.ArgumentParser(description = 'Benchmark battle simulation, rendering and startup')
+    parser.add_argument('--output', help = 'write results to this JSON file')
+    parser.add_argument('--baseline', help = 'JSON results to compare against')
+    parser.add_argument('--threshold', type = float, default = 0.1, help = 'allowed slowdown before a regression (0.1 = 10%%)')
+    parser.add_argument('--quick', action = 'store_true', help = 'fewer repeats, for a fast smoke run')
+    args = parser.parse_args()
+
+    metrics, mismatches = run_benchmarks(args.quick)
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump({'python': platform.python_version(), 'pygame': pygame.version.ver, 'platform': platform.platform(),
+                       'metrics': metrics}, file, indent = 2)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = compare(metrics, json.load(file)['metrics'], args.threshold)
+        if regressions:
+            print(f'\n{len(regressions)} regression(s): {", ".join(regressions)}')
+            sys.exit(1)
+    if mismatches:
+        print(f'\n{mismatches} dirty-rect frame(s) differ from a full redraw')
+        sys.exit(1)
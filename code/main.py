@@ -1,18 +1,34 @@
 from settings import *
 from support import *
-from timer import Timer
+from timer import Timer, FramePacer
 from monster import *
-from random import choice
+from battle import BattleEngine, smart_policy, warm_attack_cache
+from ai import ExpectimaxPolicy
+from replay import write_replay
+from tables import TABLES
 from ui import *
 from attack import AttackAnimationSprite
+from renderer import DirtyRenderer
+from assets import ASSETS
+from profiler import FrameProfiler
+from text import get_font
+import struct
+
+# Game snapshot layout: magic, version, game state, timer flags (bit 0 'player end', bit 1 'opponent end'),
+# elapsed ms of both timers, has battle - followed by the battle engine snapshot
+GAME_SNAPSHOT_MAGIC = b'ECGS'
+GAME_SNAPSHOT_VERSION = 1
+GAME_SNAPSHOT_HEADER = struct.Struct('<4sBBBIIB')
+GAME_STATES = ['selection', 'playing', 'win', 'lose']
 
 class Game:
     def __init__(self):
         pygame.init()
         pygame.mixer.init()
-        self.display_surface = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+        self.pacer = FramePacer()  # FPS cap, idle throttling and vsync
+        self.profiler = FrameProfiler()  # Per-phase frame timings (F3 overlay, F4 trace export)
+        self.display_surface = self.pacer.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
         pygame.display.set_caption('Elemental Creatures Battle')
-        self.clock = pygame.time.Clock()
         self.running = True
         self.import_assets()
         
@@ -22,137 +38,110 @@ class Game:
             self.audio['music'].stop()  # Stop current music instance
             self.audio['music'].play(-1)  # Start fresh music
         
-        self.player_active = True
         # Game state management - tracks game state
         self.game_state = 'selection'  # Can be: 'selection', 'playing', 'win', 'lose'
         
         self.end_game_font = pygame.font.Font(None, 72)     # Large font for win/lose message
         self.instruction_font = pygame.font.Font(None, 36)  # Medium font for instructions        # Initialize creature selection screen
-        self.creature_selection = CreatureSelection(self.simple_surfs)
+        self.creature_selection = CreatureSelection(self.portraits)
         
         # Game components (will be initialized after creature selection)
+        self.battle = None  # Headless BattleEngine holding the rules and both teams
         self.all_sprites = None
         self.player_monsters = None
         self.monster = None
         self.opponent = None
         self.opponent_team = None  # List of 5 opponent creatures (increased for difficulty)
-        self.current_opponent_index = 0  # Track which opponent creature is active        self.ui = None
+        self.ui = None
         self.opponent_ui = None
         self.timers = None
+        self.renderer = None  # DirtyRenderer of the battle screen when DIRTY_RECTS is on
+        self.end_screen = None  # Final battle frame with the win/lose overlay, composited once
+
+    @property
+    def player_active(self):
+        """Whether the player may choose an action (owned by the battle engine)"""
+        return self.battle is not None and self.battle.player_active
+
+    @property
+    def current_opponent_index(self):
+        """Which opponent creature is active (owned by the battle engine)"""
+        return self.battle.opponent_index if self.battle is not None else 0
 
     def get_input(self, state, data = None):
         if state == 'attack':
-            self.apply_attack(self.opponent, data)
+            self.battle.player_action('attack', TABLES.attack_ids[data])
+            self.play_attack_effects(self.opponent, data)
         elif state == 'heal':
-            # DIFFICULTY: Reduced healing from 50 to 30 to make healing less powerful
-            self.monster.health += 30
-            AttackAnimationSprite(self.monster, self.attack_frames['green'], self.all_sprites)
+            self.battle.player_action('heal')
+            AttackAnimationSprite(self.monster, self.attack_frames['green'], self.all_sprites, sheet_layout('green')['frame_duration'])
             if 'green' in self.audio:
                 self.audio['green'].play()
         elif state == 'switch':
-            self.monster.kill()
-            self.monster = data
-            self.all_sprites.add(self.monster)
-            self.ui.monster = self.monster
-
+            self.battle.player_action('switch', self.player_monsters.index(data))
+            self.show_player_monster()
         elif state == 'escape':
+            self.battle.player_action('escape')
+            self.save_replay()
             self.running = False
-        self.player_active = False
         self.timers['player end'].activate()
 
-    def apply_attack(self, target, attack):
+    def play_attack_effects(self, target, attack):
         """
-        Apply damage from one Creature to another
-        - target: Creature receiving the attack
+        Show the animation and sound of an attack the battle engine already resolved
+        - target: sprite receiving the attack
         - attack: name of the attack being used
         """
-        attack_data = ATTACK_DATA[attack]  # Get attack details (damage, element, animation)
-        # Calculate type effectiveness multiplier (2x, 1x, or 0.5x damage)
-        attack_multiplier = ELEMENT_DATA[attack_data['element']][target.element]
-        # Apply damage = base damage × type effectiveness
-        target.health -= attack_data['damage'] * attack_multiplier        # Show attack animation on target
-        AttackAnimationSprite(target, self.attack_frames[attack_data['animation']], self.all_sprites)
+        attack_data = ATTACK_DATA[attack]
+        # Show attack animation on target
+        AttackAnimationSprite(target, self.attack_frames[attack_data['animation']], self.all_sprites,
+                              sheet_layout(attack_data['animation'])['frame_duration'])
         
         # Play attack sound effect if available
         if attack_data['animation'] in self.audio:
             self.audio[attack_data['animation']].play()
 
+    def show_player_monster(self):
+        """Swap the player sprite to the creature the battle engine has active"""
+        self.monster.kill()
+        self.monster = self.player_monsters[self.battle.player_index]
+        self.all_sprites.add(self.monster)
+        self.ui.monster = self.monster
+
     def opponent_turn(self):
-        if self.opponent.health <= 0:
-            # Move to next opponent creature
-            self.current_opponent_index += 1
-            if self.current_opponent_index < len(self.opponent_team):                # Switch to next opponent creature
-                self.player_active = True
-                self.opponent.kill()
-                next_opponent = self.opponent_team[self.current_opponent_index]
-                self.opponent = Opponent(next_opponent.name, self.front_surfs[CREATURE_IMAGE_MAP[next_opponent.name]], self.all_sprites)
-                self.opponent_ui.monster = self.opponent
-                self.opponent_ui.opponent_index = self.current_opponent_index  # Update UI index
-            else:
-                # Player wins - defeated all opponent creatures
-                self.game_state = 'win'
-                self.player_active = False
-        else:
-            # DIFFICULTY: Smarter AI - choose attacks based on type effectiveness
-            attack = self.choose_smart_attack()
-            self.apply_attack(self.monster, attack)
+        opponent_index = self.battle.opponent_index
+        # DIFFICULTY: Smarter AI - choose attacks based on type effectiveness
+        attack = self.battle.opponent_turn()
+        if attack is not None:
+            self.play_attack_effects(self.monster, TABLES.attack_names[attack])
             self.timers['opponent end'].activate()
-
-    def choose_smart_attack(self):
-        """AI chooses attacks more strategically based on type effectiveness and damage"""
-        from random import random
-        
-        # Get player monster's element
-        player_element = CREATURE_DATA[self.monster.name]['element']
-        
-        # Categorize attacks by effectiveness and damage
-        super_effective_attacks = []
-        high_damage_attacks = []
-        normal_attacks = []
-        
-        for attack_name in self.opponent.abilities:
-            attack_element = ATTACK_DATA[attack_name]['element']
-            attack_damage = ATTACK_DATA[attack_name]['damage']
-            
-            # Check type effectiveness
-            effectiveness = 1.0
-            if attack_element in ELEMENT_DATA:
-                effectiveness = ELEMENT_DATA[attack_element].get(player_element, 1.0)
-            
-            # Categorize attack
-            if effectiveness > 1.0:  # Super effective
-                super_effective_attacks.append(attack_name)
-            elif attack_damage >= 40:  # High damage attacks
-                high_damage_attacks.append(attack_name)
-            else:
-                normal_attacks.append(attack_name)
-        
-        # DIFFICULTY: Smarter attack selection
-        # 60% chance for super effective, 30% for high damage, 10% for normal
-        rand = random()
-        if super_effective_attacks and rand < 0.6:
-            return choice(super_effective_attacks)
-        elif high_damage_attacks and rand < 0.9:
-            return choice(high_damage_attacks)
-        elif normal_attacks:
-            return choice(normal_attacks)
-        else:
-            # Fallback to any attack
-            return choice(self.opponent.abilities)
+        elif self.battle.state == 'win':
+            # Player wins - defeated all opponent creatures
+            self.game_state = 'win'
+            self.save_replay()
+        elif self.battle.opponent_index != opponent_index:
+            # Switch to next opponent creature
+            self.opponent.kill()
+            next_opponent = self.opponent_team[self.battle.opponent_index]
+            self.opponent = Opponent(next_opponent, self.front_surfs[CREATURE_IMAGE_MAP[next_opponent.name]], self.all_sprites)
+            self.opponent_ui.monster = self.opponent
+            self.opponent_ui.opponent_index = self.battle.opponent_index  # Update UI index
 
     def player_turn(self):
-        self.player_active = True
-        if self.monster.health <= 0:
-            available_monsters = [monster for monster in self.player_monsters if monster.health > 0]
-            if available_monsters:
-                self.monster.kill()
-                self.monster = available_monsters[0]
-                self.all_sprites.add(self.monster)
-                self.ui.monster = self.monster
-            else:
-                # Player loses - all monsters defeated
-                self.game_state = 'lose'
-                self.player_active = False
+        player_index = self.battle.player_index
+        self.battle.player_turn()
+        if self.battle.state == 'lose':
+            # Player loses - all monsters defeated
+            self.game_state = 'lose'
+            self.save_replay()
+        elif self.battle.player_index != player_index:
+            self.show_player_monster()
+
+    def save_replay(self):
+        """Write the finished battle's replay so it can be re-simulated headlessly (see replay.py)"""
+        if REPLAY_FOLDER is not None:
+            base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            write_replay(self.battle, join(base_dir, REPLAY_FOLDER))
 
     def update_timers(self):
         for timer in self.timers.values():
@@ -170,29 +159,31 @@ class Game:
         
         # Reset to creature selection state
         self.game_state = 'selection'
-        self.player_active = True
         
-        # Reinitialize audio
-        self.import_assets()
+        # Assets stay loaded between rounds, only sounds past the memory budget are dropped
+        ASSETS.trim()
         if 'music' in self.audio:
             self.audio['music'].play(-1)
         
         # Reset creature selection
-        self.creature_selection = CreatureSelection(self.simple_surfs)
+        self.creature_selection = CreatureSelection(self.portraits)
         
         # Clear game components (will be recreated after selection)
+        self.battle = None
         self.all_sprites = None
         self.player_monsters = None
         self.monster = None
         self.opponent = None
         self.opponent_team = None
-        self.current_opponent_index = 0
         self.ui = None
         self.opponent_ui = None
         self.timers = None
+        self.renderer = None
+        self.end_screen = None
 
     def handle_end_game_input(self):
         for event in pygame.event.get():
+            self.handle_profiler_key(event)
             if event.type == pygame.QUIT:
                 self.running = False
             elif event.type == pygame.KEYDOWN:
@@ -205,6 +196,18 @@ class Game:
                 elif event.key == pygame.K_ESCAPE:
                     self.running = False
 
+    def handle_profiler_key(self, event):
+        """F3 toggles the frame profiler overlay, F4 saves its buffer as a Chrome trace"""
+        if event.type != pygame.KEYDOWN:
+            return
+        if event.key == PROFILER_OVERLAY_KEY:
+            self.profiler.visible = not self.profiler.visible
+            if self.renderer is not None:
+                self.renderer.invalidate()  # Repaint the area under a hidden overlay
+        elif event.key == PROFILER_TRACE_KEY:
+            base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            print(f'Frame trace saved to {self.profiler.export_chrome_trace(join(base_dir, PROFILER_FOLDER))}')
+
     def draw_end_game_screen(self):
         # Semi-transparent overlay
         overlay = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
@@ -235,19 +238,73 @@ class Game:
         self.display_surface.blit(exit_surf, exit_rect)
 
     def import_assets(self):
-        self.back_surfs = folder_importer('images', 'back')
-        self.front_surfs = folder_importer('images', 'front')
-        self.bg_surfs = folder_importer('images', 'other')
-        self.simple_surfs = folder_importer('images', 'simple')
-        self.attack_frames = tile_importer(4,'images', 'attacks')
-        self.audio = audio_importer('audio')
+        # Loaded once per process and shared by every round (see assets.py)
+        # Only the selection screen's portraits are loaded here, the battle assets keep loading in the background
+        assets = ASSETS.load_selection(progress = self.draw_loading)
+        self.portraits = assets.portraits
+        self.audio = assets.audio
+
+    def import_battle_assets(self):
+        # The loading screen only shows if the background load hasn't finished yet
+        assets = ASSETS.load(progress = None if ASSETS.ready() else self.draw_loading)
+        self.back_surfs = assets.back_surfs
+        self.front_surfs = assets.front_surfs
+        self.bg_surfs = assets.bg_surfs
+        self.attack_frames = assets.attack_frames
+
+    def draw_loading(self, done, total):
+        """Loading screen: a progress bar of the asset files decoded so far"""
+        pygame.event.pump()  # Keep the window responsive while loading
+        self.display_surface.fill((20, 25, 60))
+        bar = pygame.Rect(0, 0, 400, 20)
+        bar.center = (WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2)
+        pygame.draw.rect(self.display_surface, (50, 50, 50), bar)
+        pygame.draw.rect(self.display_surface, (100, 255, 100), (bar.left, bar.top, bar.width * done // total, bar.height))
+        pygame.draw.rect(self.display_surface, (200, 200, 200), bar, 2)
+        text_surf = get_font(24).render(f"Loading... {done}/{total}", True, (255, 255, 255))  # Changes every call, so not cached
+        self.display_surface.blit(text_surf, text_surf.get_rect(center = (bar.centerx, bar.bottom + 20)))
+        pygame.display.update()
+
+    def draw_battle(self):
+        """Draw the whole battle screen: background, floors, creatures, attack animations and both UIs"""
+        self.profiler.mark('draw background')
+        self.display_surface.blit(self.bg_surfs['bg'], (0,0))
+        self.profiler.mark('draw floors')
+        self.draw_monster_floor()
+        self.profiler.mark('all_sprites.draw')
+        if self.all_sprites is not None:
+            self.all_sprites.draw(self.display_surface)
+        self.profiler.mark('ui.draw')
+        if self.ui is not None:
+            self.ui.draw()
+        self.profiler.mark('opponent_ui.draw')
+        if self.opponent_ui is not None:
+            self.opponent_ui.draw()
+
+    def floor_rect(self, sprite):
+        return self.bg_surfs['floor'].get_rect(center = sprite.rect.midbottom + pygame.Vector2(0, -10))
 
     def draw_monster_floor(self):
         if self.all_sprites is not None:
             for sprite in self.all_sprites:
-                if isinstance(sprite, Creature):
-                    floor_rect = self.bg_surfs['floor'].get_rect(center = sprite.rect.midbottom + pygame.Vector2(0, -10))
-                    self.display_surface.blit(self.bg_surfs['floor'], floor_rect)
+                if isinstance(sprite, CreatureSprite):
+                    self.display_surface.blit(self.bg_surfs['floor'], self.floor_rect(sprite))
+
+    def battle_layers(self):
+        """The battle screen as DirtyRenderer layers, in drawing order"""
+        floor = self.bg_surfs['floor']
+        layers = {}
+        for sprite in self.all_sprites:
+            if isinstance(sprite, CreatureSprite):
+                rect = self.floor_rect(sprite)
+                layers[('floor', sprite)] = (rect, 'floor', lambda surface, rect = rect: surface.blit(floor, rect))
+        for sprite in self.all_sprites:
+            # An attack animation changes its key on every new frame image
+            layers[sprite] = (sprite.rect, id(sprite.image), lambda surface, sprite = sprite: surface.blit(sprite.image, sprite.rect))
+        layers['ui'] = (self.ui.bounds(), None, lambda surface: self.ui.draw())  # Menu glow pulses every frame
+        opponent_key = (self.opponent.name, self.opponent.health, self.opponent_ui.opponent_index)
+        layers['opponent ui'] = (self.opponent_ui.panel_rect(), opponent_key, lambda surface: self.opponent_ui.draw())
+        return layers
 
     def display_end_game_message(self, message):
         text_surface = self.end_game_font.render(message, True, (255, 255, 255))
@@ -260,97 +317,165 @@ class Game:
 
     def initialize_battle(self, selected_creatures):
         """Initialize the battle after creature selection is complete"""
+        # Battle rules and state live in the headless engine, the sprites below only show it
+        # DIFFICULTY: The engine builds a gauntlet of 5 opponents (increased from 4)
+        self.battle = BattleEngine(selected_creatures, opponent_policy = self.create_opponent_policy())
+        warm_attack_cache(self.battle.opponent_team)  # AI attack categories are ready before the first turn
+        self.build_battle_view()
+        
+        # Change to playing state (the engine starts with the player active)
+        self.game_state = 'playing'
+
+    def create_opponent_policy(self):
+        """AI_DIFFICULTY 'hard' swaps the type-aware attack picks for a time-boxed game tree search"""
+        return ExpectimaxPolicy() if AI_DIFFICULTY == 'hard' else smart_policy
+
+    def build_battle_view(self):
+        """Create sprites, UI and timers showing self.battle (a new battle or a restored snapshot)"""
+        self.import_battle_assets()  # Waits only for battle assets still loading
+        self.opponent_team = self.battle.opponent_team
+
         # Sprite groups - containers that hold and manage game objects
         self.all_sprites = pygame.sprite.Group()  # Holds all visible game sprites
         
-        # Create creature objects using the selected creatures
-        self.player_monsters = [Monster(name, self.back_surfs[CREATURE_IMAGE_MAP[name]]) for name in selected_creatures]
-        self.monster = self.player_monsters[0]  # Currently active creature (first in list)
+        # Create creature sprites for the player's team
+        self.player_monsters = [Monster(creature, self.back_surfs[CREATURE_IMAGE_MAP[creature.name]]) for creature in self.battle.player_team]
+        self.monster = self.player_monsters[self.battle.player_index]  # Currently active creature
         self.all_sprites.add(self.monster)      # Add active creature to sprite group for rendering
-          # Create opponent team - 5 random creatures (excluding player's creatures to avoid duplicates)
-        # DIFFICULTY: Increased from 4 to 5 opponents to make game longer and harder
-        available_opponents = [name for name in CREATURE_DATA.keys() if name not in selected_creatures]
-        if len(available_opponents) < 5:
-            # If not enough unique creatures, allow duplicates
-            available_opponents = list(CREATURE_DATA.keys())
-        
-        self.opponent_team = []
-        for i in range(5):
-            opponent_name = choice(available_opponents)
-            opponent_monster = Monster(opponent_name, self.front_surfs[CREATURE_IMAGE_MAP[opponent_name]])
-            self.opponent_team.append(opponent_monster)
-            # Remove from available to avoid immediate duplicates (but could repeat if needed)
-            if opponent_name in available_opponents:
-                available_opponents.remove(opponent_name)
-            if not available_opponents:  # If we run out, refill
-                available_opponents = [name for name in CREATURE_DATA.keys()]
         
-        # Set first opponent as active
-        self.opponent = Opponent(self.opponent_team[0].name, self.front_surfs[CREATURE_IMAGE_MAP[self.opponent_team[0].name]], self.all_sprites)
-        self.current_opponent_index = 0
+        # Set current opponent as active
+        self.opponent = Opponent(self.battle.opponent, self.front_surfs[CREATURE_IMAGE_MAP[self.battle.opponent.name]], self.all_sprites)
         
         # ui
-        self.ui = UI(self.monster, self.player_monsters, self.simple_surfs, self.get_input)
-        self.opponent_ui = OpponentUI(self.opponent, self.current_opponent_index, len(self.opponent_team))# timers
-        self.timers = {'player end': Timer(1000, func = self.opponent_turn), 'opponent end': Timer(1000, func = self.player_turn)}
+        self.ui = UI(self.monster, self.player_monsters, self.portraits, self.get_input)
+        self.opponent_ui = OpponentUI(self.opponent, self.current_opponent_index, len(self.opponent_team))
         
-        # Set player as active and change to playing state
-        self.player_active = True
-        self.game_state = 'playing'
+        # timers
+        self.timers = {'player end': Timer(1000, func = self.opponent_turn), 'opponent end': Timer(1000, func = self.player_turn)}
 
-    def run(self):
-        while self.running:
-            dt = self.clock.tick() / 1000
+        # Optional dirty-rect rendering, starting with a full repaint
+        self.renderer = DirtyRenderer(self.display_surface, self.bg_surfs['bg']) if DIRTY_RECTS else None
+        self.end_screen = None
+
+    def snapshot(self):
+        """
+        Serialize the game (state, pending timers and the whole battle) to bytes
+        Backs save/resume and crash recovery; no pygame objects are pickled
+        """
+        flags, elapsed = 0, [0, 0]
+        if self.timers is not None:
+            for bit, name in enumerate(('player end', 'opponent end')):
+                if self.timers[name].active:
+                    flags |= 1 << bit
+                    elapsed[bit] = self.timers[name].elapsed()
+        header = GAME_SNAPSHOT_HEADER.pack(GAME_SNAPSHOT_MAGIC, GAME_SNAPSHOT_VERSION, GAME_STATES.index(self.game_state),
+                                           flags, elapsed[0], elapsed[1], self.battle is not None)
+        return header + (self.battle.snapshot() if self.battle is not None else b'')
+
+    def restore(self, data):
+        """Resume a game from snapshot bytes, rebuilding sprites and UI around the restored battle"""
+        magic, version, game_state, flags, *elapsed, has_battle = GAME_SNAPSHOT_HEADER.unpack_from(data)
+        if magic != GAME_SNAPSHOT_MAGIC or version != GAME_SNAPSHOT_VERSION:
+            raise ValueError('not a game snapshot (or an unsupported version)')
+        if not has_battle:
+            self.restart_game()
+            return
+
+        self.battle = BattleEngine.from_snapshot(memoryview(data)[GAME_SNAPSHOT_HEADER.size:], self.create_opponent_policy())
+        self.build_battle_view()
+        for bit, name in enumerate(('player end', 'opponent end')):
+            if flags & 1 << bit:
+                self.timers[name].resume(elapsed[bit])
+        self.game_state = GAME_STATES[game_state]
+
+    def is_idle(self):
+        """Whether nothing animates, so the frame rate can drop to IDLE_FPS"""
+        if self.game_state in ('win', 'lose'):
+            return True
+        if self.game_state != 'playing':
+            return False
+        # Waiting on the 'player end'/'opponent end' timer once the attack animation has finished
+        waiting = any(timer.active for timer in self.timers.values())
+        return waiting and not any(isinstance(sprite, AttackAnimationSprite) for sprite in self.all_sprites)
+
+    def frame(self, dt):
+        """Handle input, update and draw one frame for the current game state"""
+        dirty = None  # Screen areas to flip, None for the whole window
+        self.profiler.begin_frame()
+        self.profiler.mark('event pump')
+        if self.game_state == 'selection':
+            # Creature selection events
+            for event in pygame.event.get():
+                self.handle_profiler_key(event)
+                if event.type == pygame.QUIT:
+                    self.running = False
+            
+            # Handle creature selection
+            self.profiler.mark('selection input')
+            if self.creature_selection.handle_input():
+                # Selection complete, initialize battle
+                self.initialize_battle(self.creature_selection.selected_creatures)
+            
+            # Draw creature selection screen
+            self.profiler.mark('selection draw')
+            self.creature_selection.draw()
+            
+        elif self.game_state == 'playing':
+            # Normal game events
+            events = pygame.event.get()
+            for event in events:
+                self.handle_profiler_key(event)
+                if event.type == pygame.QUIT:
+                    self.running = False
+                elif event.type == pygame.VIDEOEXPOSE and self.renderer is not None:
+                    self.renderer.invalidate()
+           
+            # update
+            self.profiler.mark('update_timers')
+            self.update_timers()
+            self.profiler.mark('all_sprites.update')
+            self.all_sprites.update(dt)
+            self.profiler.mark('ui.update')
+            if self.player_active:
+                self.ui.update()
+
+            # draw
+            if self.renderer is not None:
+                self.profiler.mark('dirty render')
+                dirty = self.renderer.render(self.battle_layers())
+            else:
+                self.draw_battle()
             
-            if self.game_state == 'selection':                # Creature selection events
-                for event in pygame.event.get():
-                    if event.type == pygame.QUIT:
-                        self.running = False
-                
-                # Handle creature selection
-                if self.creature_selection.handle_input():
-                    # Selection complete, initialize battle
-                    self.initialize_battle(self.creature_selection.selected_creatures)
-                
-                # Draw creature selection screen
-                self.creature_selection.draw()
-                
-            elif self.game_state == 'playing':
-                # Normal game events
-                events = pygame.event.get()
-                for event in events:
-                    if event.type == pygame.QUIT:
-                        self.running = False
-               
-                # update
-                self.update_timers()
-                self.all_sprites.update(dt)
-                if self.player_active:
-                    self.ui.update()                # draw  
-                self.display_surface.blit(self.bg_surfs['bg'], (0,0))
-                self.draw_monster_floor()
-                self.all_sprites.draw(self.display_surface)
-                self.ui.draw()
-                self.opponent_ui.draw()
-                
-            elif self.game_state in ['win', 'lose']:
-                # Handle end game input
-                self.handle_end_game_input()
-                
-                # Continue drawing the game background
-                self.display_surface.blit(self.bg_surfs['bg'], (0,0))
-                self.draw_monster_floor()
-                if self.all_sprites is not None:
-                    self.all_sprites.draw(self.display_surface)
-                if self.ui is not None:
-                    self.ui.draw()
-                if self.opponent_ui is not None:
-                    self.opponent_ui.draw()
-                
-                # Draw end game screen overlay
-                self.draw_end_game_screen()
+        elif self.game_state in ['win', 'lose']:
+            # Handle end game input
+            self.handle_end_game_input()
+            self.profiler.mark('end screen')
             
+            # The battle has stopped, so its last frame and the overlay are composited once
+            if self.game_state in ['win', 'lose']:
+                if self.end_screen is None:
+                    self.draw_battle()
+                    self.draw_end_game_screen()
+                    self.end_screen = self.display_surface.copy()
+                self.display_surface.blit(self.end_screen, (0, 0))
+        
+        if self.profiler.visible:
+            self.profiler.mark('profiler overlay')
+            overlay_rect = self.profiler.draw(self.display_surface)
+            if dirty is not None:
+                dirty.append(overlay_rect)
+
+        self.profiler.mark('display.update')
+        if dirty is None:
             pygame.display.update()
+        else:
+            pygame.display.update(dirty)
+        self.profiler.end_frame()
+
+    def run(self):
+        while self.running:
+            dt = self.pacer.tick(self.is_idle())
+            self.frame(dt)
         
         pygame.quit()
     
@@ -0,0 +1,121 @@
+"""
+Frame-time profiler for the main loop
+Game.frame marks where each phase (event pump, timers, sprite updates, each draw call,
+display.update) starts; the last PROFILER_FRAMES frames are kept in a ring buffer.
+In game, F3 shows p50/p99 frame times, the slowest phases and a spike graph, and
+F4 saves the buffer as a Chrome trace (open it in chrome://tracing or ui.perfetto.dev).
+"""
+from settings import *
+from text import get_font
+from time import perf_counter, strftime
+import json
+import os
+
+class FrameProfiler:
+    """Per-phase timings of recent frames, with an in-game overlay and Chrome trace export"""
+    def __init__(self, capacity = PROFILER_FRAMES, graph_frames = 120):
+        """
+        - capacity: frames kept in the ring buffer
+        - graph_frames: frames shown in the overlay's spike graph
+        """
+        self.capacity = capacity
+        self.graph_frames = graph_frames
+        self.frames = [None] * capacity  # Ring of (frame start, [(phase, phase start)...], frame end)
+        self.next = 0
+        self.count = 0
+        self.total = 0  # Frames recorded since start, including the ones overwritten
+        self.start = 0.0
+        self.phases = []
+        self.visible = False
+        self.overlay = None
+        self.overlay_frame = -1
+
+    def begin_frame(self):
+        self.start = perf_counter()
+        self.phases = []
+
+    def mark(self, phase):
+        """Start a phase; it runs until the next mark or the end of the frame"""
+        self.phases.append((phase, perf_counter()))
+
+    def end_frame(self):
+        self.frames[self.next] = (self.start, self.phases, perf_counter())
+        self.next = (self.next + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+        self.total += 1
+
+    def recent(self):
+        """Recorded frames, oldest first"""
+        if self.count < self.capacity:
+            return self.frames[:self.count]
+        return self.frames[self.next:] + self.frames[:self.next]
+
+    def frame_times(self):
+        """Frame durations in ms, oldest first"""
+        return [(end - start) * 1000 for start, _, end in self.recent()]
+
+    def phase_times(self):
+        """Average ms per frame spent in each phase"""
+        totals = {}
+        frames = self.recent()
+        for _, phases, end in frames:
+            for (phase, start), (_, next_start) in zip(phases, phases[1:] + [(None, end)]):
+                totals[phase] = totals.get(phase, 0.0) + (next_start - start) * 1000
+        return {phase: total / len(frames) for phase, total in totals.items()}
+
+    def percentile(self, times, fraction):
+        ordered = sorted(times)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+    def draw(self, surface, pos = (10, 10)):
+        """Draw the overlay (rebuilt every 15 frames so its own text stays cheap) and return its rect"""
+        if self.count and (self.overlay is None or self.total - self.overlay_frame >= 15):
+            self.overlay = self.render_overlay()
+            self.overlay_frame = self.total
+        if self.overlay is None:
+            return pygame.Rect(pos, (0, 0))
+        return surface.blit(self.overlay, pos)
+
+    def render_overlay(self, size = (320, 200)):
+        overlay = pygame.Surface(size)
+        overlay.fill((10, 10, 25))
+        pygame.draw.rect(overlay, (100, 150, 255), overlay.get_rect(), 1)
+        font = get_font(20)  # Numbers change constantly, so this text bypasses the shared text cache
+
+        times = self.frame_times()
+        lines = [f'frame p50 {self.percentile(times, 0.5):.2f} ms   p99 {self.percentile(times, 0.99):.2f} ms']
+        slowest = sorted(self.phase_times().items(), key = lambda item: item[1], reverse = True)[:4]
+        lines.extend(f'{phase:<20} {ms:6.2f} ms' for phase, ms in slowest)
+        for row, line in enumerate(lines):
+            overlay.blit(font.render(line, True, (220, 220, 220)), (8, 6 + row * 18))
+
+        # Spike graph of the latest frames: the line is the frame budget, red bars went over it
+        budget = 1000 / FPS if FPS else 1000 / 60
+        graph = pygame.Rect(8, 104, size[0] - 16, size[1] - 112)
+        scale = graph.height / (budget * 3)
+        bar_width = max(1, graph.width // self.graph_frames)
+        for index, ms in enumerate(times[-self.graph_frames:]):
+            height = min(graph.height, max(1, int(ms * scale)))
+            color = (255, 80, 80) if ms > budget else (100, 220, 100)
+            pygame.draw.rect(overlay, color, (graph.left + index * bar_width, graph.bottom - height, bar_width, height))
+        budget_y = graph.bottom - int(budget * scale)
+        pygame.draw.line(overlay, (255, 255, 100), (graph.left, budget_y), (graph.right, budget_y))
+        return overlay
+
+    def export_chrome_trace(self, folder):
+        """Save the ring buffer as Chrome trace-event JSON and return the file path"""
+        frames = self.recent()
+        origin = frames[0][0] if frames else 0.0
+        events = []
+        for number, (start, phases, end) in enumerate(frames):
+            events.append({'name': 'frame', 'cat': 'frame', 'ph': 'X', 'pid': 0, 'tid': 0, 'args': {'frame': number},
+                           'ts': (start - origin) * 1e6, 'dur': (end - start) * 1e6})
+            for (phase, phase_start), (_, phase_end) in zip(phases, phases[1:] + [(None, end)]):
+                events.append({'name': phase, 'cat': 'phase', 'ph': 'X', 'pid': 0, 'tid': 0,
+                               'ts': (phase_start - origin) * 1e6, 'dur': (phase_end - phase_start) * 1e6})
+
+        os.makedirs(folder, exist_ok = True)
+        path = join(folder, f'trace-{strftime("%Y%m%d-%H%M%S")}.json')
+        with open(path, 'w') as file:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, file)
+        return path
@@ -0,0 +1,121 @@
+"""
+Pre-rendered surfaces for the UI
+Anything that looks the same on many frames is drawn once here and blitted afterwards,
+instead of being rebuilt with draw calls every frame.
+"""
+from settings import *
+import math
+
+class GradientBackground:
+    """
+    Animated dark blue/purple gradient of the creature selection screen
+    The colour of each row only depends on the row and the animation time, so one frame is a
+    single pixel wide column that gets stretched across the window. The three colour waves
+    (speeds 1, 1.5 and 0.8) all repeat after 20π, so the animation is a loop of `frames` columns,
+    each rendered the first time it is shown.
+    """
+    PERIOD = 20 * math.pi
+
+    def __init__(self, height = WINDOW_HEIGHT, frames = 1024):
+        """
+        - height: rows in the gradient (columns are stretched to the target surface's size)
+        - frames: columns in one loop - more frames means smoother colour changes
+        """
+        self.height = height
+        self.frames = frames
+        self.columns = [None] * frames
+
+    def frame_index(self, time):
+        """Ring index of the column for an animation time (CreatureSelection.pulse_timer)"""
+        return int(time % self.PERIOD / self.PERIOD * self.frames) % self.frames
+
+    def column(self, time, surface):
+        index = self.frame_index(time)
+        if self.columns[index] is None:
+            self.columns[index] = self.render_column(index * self.PERIOD / self.frames, surface)
+        return self.columns[index]
+
+    def render_column(self, time, surface):
+        """One frame of the gradient as a 1 pixel wide surface in the pixel format of the target surface"""
+        column = pygame.Surface((1, self.height), 0, surface)
+        for y in range(self.height):
+            # Smooth gradient from dark blue to dark purple
+            r = int(20 + 10 * math.sin(time + y * 0.01))
+            g = int(25 + 15 * math.sin(time * 1.5 + y * 0.01))
+            b = int(60 + 20 * math.sin(time * 0.8 + y * 0.01))
+            column.set_at((0, y), (max(0, min(255, r)), max(0, min(255, g)), max(0, min(255, b))))
+        return column
+
+    def draw(self, surface, time):
+        """Fill a whole surface with the gradient frame for an animation time"""
+        pygame.transform.scale(self.column(time, surface), surface.get_size(), surface)
+
+class PortraitCache:
+    """
+    Creature portraits (images/simple) smoothscaled once per size
+    Screens warm the sizes they draw when they are created, so drawing a portrait is a
+    dictionary lookup instead of a per-frame transform.scale.
+    """
+    def __init__(self, simple_surfs):
+        self.simple_surfs = simple_surfs
+        self.surfaces = {}  # (image name, size) -> scaled surface
+
+    def get(self, creature_name, size):
+        """Square portrait of a creature, or None if it has no image"""
+        image_key = CREATURE_IMAGE_MAP.get(creature_name, creature_name)
+        key = (image_key, size)
+        if key not in self.surfaces:
+            if image_key not in self.simple_surfs:
+                return None
+            self.surfaces[key] = pygame.transform.smoothscale(self.simple_surfs[image_key], (size, size))
+        return self.surfaces[key]
+
+    def warm(self, sizes, creature_names = CREATURE_DATA):
+        """Scale every creature's portrait to each size up front"""
+        for name in creature_names:
+            for size in sizes:
+                self.get(name, size)
+
+class PanelCache:
+    """
+    UI panel backgrounds and glows, each built once and shared by every screen
+    The pulsing glow behind a selected button (alpha 100 + 50·sin(3·time)) is a ring of
+    `glow_frames` pre-rendered alpha steps, picked by time instead of redrawn every frame.
+    """
+    def __init__(self, glow_frames = 32):
+        self.glow_frames = glow_frames
+        self.surfaces = {}
+
+    def gradient(self, size, color, alpha, fade, min_alpha = 0):
+        """Panel of a solid colour whose alpha falls by `fade` from top to bottom (never below min_alpha)"""
+        key = ('gradient', size, color, alpha, fade, min_alpha)
+        if key not in self.surfaces:
+            width, height = size
+            surf = pygame.Surface(size, pygame.SRCALPHA)
+            for y in range(height):
+                pygame.draw.line(surf, (*color, max(min_alpha, alpha - (y * fade // height))), (0, y), (width, y))
+            self.surfaces[key] = surf
+        return self.surfaces[key]
+
+    def glow(self, size, color, time):
+        """Rounded button glow at its pulse alpha for an animation time"""
+        index = int(time * 3 / (2 * math.pi) * self.glow_frames) % self.glow_frames
+        key = ('glow', size, color, index)
+        if key not in self.surfaces:
+            alpha = 100 + int(50 * math.sin(2 * math.pi * index / self.glow_frames))
+            surf = pygame.Surface(size, pygame.SRCALPHA)
+            pygame.draw.rect(surf, (*color, alpha), (0, 0, *size), border_radius = 8)
+            self.surfaces[key] = surf
+        return self.surfaces[key]
+
+    def circle(self, diameter, color, alpha):
+        """Translucent disc, like the glow behind a selected creature card"""
+        key = ('circle', diameter, color, alpha)
+        if key not in self.surfaces:
+            surf = pygame.Surface((diameter, diameter), pygame.SRCALPHA)
+            pygame.draw.circle(surf, (*color, alpha), (diameter // 2, diameter // 2), diameter // 2)
+            self.surfaces[key] = surf
+        return self.surfaces[key]
+
+PANELS = PanelCache()  # Shared by every UI class
+SELECTION_BACKGROUND = GradientBackground()  # Shared by every round's selection screen, so its columns stay rendered
@@ -0,0 +1,73 @@
+"""
+Dirty-rectangle rendering for slow displays (DIRTY_RECTS in settings.py)
+Only the screen areas that changed since the last frame are recomposed and sent to the display,
+instead of redrawing and flipping the whole window every frame.
+"""
+from settings import *
+
+def merge_rects(rects):
+    """Union overlapping rects until none overlap, so every area is repainted exactly once"""
+    merged = []
+    for rect in rects:
+        rect = pygame.Rect(rect)
+        overlapping = rect.collidelist(merged)
+        while overlapping != -1:
+            rect.union_ip(merged.pop(overlapping))
+            overlapping = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
+
+class DirtyRenderer:
+    """
+    Composites a scene described as layers over a static background
+    Every frame the caller passes its layers in drawing order as {layer id: (rect, key, draw)}:
+    - rect: the screen area the layer paints in
+    - key: what the layer shows (an image id, a health value...) - None means it animates
+      on its own and is repainted every frame
+    - draw(surface): paints the layer
+    Layers whose rect or key changed mark their old and new areas dirty. Each dirty area is
+    repainted under a clip rect from the background up, drawing every layer that touches it.
+    """
+    def __init__(self, surface, background):
+        """
+        - surface: the display surface
+        - background: static surface the size of the display, painted under every layer
+        """
+        self.surface = surface
+        self.background = background
+        self.previous = {}  # layer id -> (rect, key) of the last frame
+        self.full = True
+
+    def invalidate(self):
+        """Repaint the whole screen next frame (window exposed, scene rebuilt...)"""
+        self.full = True
+
+    def dirty_rects(self, current):
+        if self.full:
+            self.full = False
+            return [self.surface.get_rect()]
+        dirty = []
+        for layer, (rect, key) in current.items():
+            previous = self.previous.get(layer)
+            if key is None or previous != (rect, key):
+                dirty.append(rect)
+                if previous is not None:
+                    dirty.append(previous[0])
+        # Layers that are gone (a finished attack animation) leave their area dirty
+        dirty.extend(rect for layer, (rect, _) in self.previous.items() if layer not in current)
+        return merge_rects(rect for rect in dirty if rect.width and rect.height)
+
+    def render(self, layers):
+        """Repaint the changed areas of a frame and return them for pygame.display.update"""
+        current = {layer: (pygame.Rect(rect), key) for layer, (rect, key, _) in layers.items()}
+        dirty = self.dirty_rects(current)
+        self.previous = current
+
+        for area in dirty:
+            self.surface.set_clip(area)
+            self.surface.blit(self.background, area, area)
+            for layer, (rect, key, draw) in layers.items():
+                if current[layer][0].colliderect(area):
+                    draw(self.surface)
+        self.surface.set_clip(None)
+        return dirty
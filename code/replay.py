@@ -0,0 +1,84 @@
+"""
+Compact battle replays
+A replay is the battle seed, the player's team and one byte per player action; everything
+else (gauntlet, attacks, AI picks) is re-created from the seed by a headless BattleEngine:
+
+    python replay.py replays/*.ecbr
+"""
+from settings import *
+from battle import BattleEngine, smart_policy, decode_action, STATES
+from tables import TABLES
+import struct
+import os
+
+MAGIC = b'ECBR'
+VERSION = 3  # 2: attack sets are rolled as one set id per creature, 3: opponent policy recorded
+# magic, version, seed, final state, opponent policy, team size - followed by team creature ids and the actions
+HEADER = struct.Struct('<4sBQBBB')
+# Opponent policies a replay can record: only smart_policy is deterministic, anything else
+# (like the time-boxed 'hard' AI, which thinks deeper on a faster machine) can't be re-simulated
+POLICIES = ('smart', 'other')
+
+def save_replay(engine):
+    """Encode a battle played by a seeded BattleEngine as replay bytes"""
+    if engine.seed is None:
+        raise ValueError('only battles with a seed can be replayed')
+    team = bytes(creature.id for creature in engine.player_team)
+    policy = POLICIES.index('smart' if engine.opponent_policy is smart_policy else 'other')
+    header = HEADER.pack(MAGIC, VERSION, engine.seed, STATES.index(engine.state), policy, len(team))
+    return header + team + bytes(engine.actions)
+
+def load_replay(data):
+    """Decode replay bytes into (seed, team names, final state, opponent policy, actions)"""
+    magic, version, seed, state, policy, team_size = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError('not a replay file (or an unsupported version)')
+    team_start = HEADER.size
+    team = [TABLES.creature_names[creature_id] for creature_id in data[team_start:team_start + team_size]]
+    actions = bytes(data[team_start + team_size:])
+    return seed, team, STATES[state], POLICIES[policy], actions
+
+def play_replay(data, opponent_policy = None):
+    """
+    Re-simulate a replay headlessly and return the finished BattleEngine
+    - opponent_policy: policy to replay against, None for the one recorded. Battles against a
+      non-deterministic policy raise ValueError unless one is given
+    """
+    seed, team, _, policy, actions = load_replay(data)
+    if opponent_policy is None:
+        if policy != 'smart':
+            raise ValueError('the battle was played against a non-deterministic opponent policy')
+        opponent_policy = smart_policy
+    engine = BattleEngine(team, seed = seed, opponent_policy = opponent_policy)
+    for code in actions:
+        if engine.state != 'playing':
+            break
+        engine.play_turn(*decode_action(engine.monster, code))
+    return engine
+
+def write_replay(engine, folder):
+    """Save a battle's replay in a folder, named after its seed"""
+    os.makedirs(folder, exist_ok = True)
+    path = join(folder, f'{engine.seed:016x}.ecbr')
+    with open(path, 'wb') as file:
+        file.write(save_replay(engine))
+    return path
+
+if __name__ == '__main__':
+    import sys
+
+    # Re-simulate every replay given and report any whose result changed
+    changed = 0
+    for path in sys.argv[1:]:
+        with open(path, 'rb') as file:
+            data = file.read()
+        expected = load_replay(data)[2]
+        try:
+            result = play_replay(data).state
+        except ValueError as e:
+            print(f'{path}: skipped ({e})')
+            continue
+        if result != expected:
+            changed += 1
+        print(f'{path}: {result}' + ('' if result == expected else f' (recorded {expected})'))
+    sys.exit(1 if changed else 0)
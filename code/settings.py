@@ -96,4 +96,48 @@ ELEMENT_DATA = {
     'aqua':   {'aqua': 1.0, 'nature': 0.5, 'flame': 2.0, 'normal': 1.0},   # Aqua puts out Flame, Nature absorbs Aqua
     'nature': {'aqua': 2.0, 'nature': 1.0, 'flame': 0.5, 'normal': 1.0},   # Nature drinks Aqua, Flame burns Nature
     'normal': {'aqua': 1.0, 'nature': 1.0, 'flame': 1.0, 'normal': 1.0},   # Normal type has no advantages/disadvantages
-}
\ No newline at end of file
+}
+
+# Battle rules shared by the game and the headless battle engine
+TEAM_SIZE = 4            # Creatures the player picks on the selection screen
+OPPONENT_TEAM_SIZE = 5   # DIFFICULTY: Increased from 4 to 5 opponents to make game longer and harder
+HEAL_AMOUNT = 30         # DIFFICULTY: Reduced healing from 50 to 30 to make healing less powerful
+
+# Opponent AI
+AI_DIFFICULTY = 'normal'  # 'normal': type-aware attack picks, 'hard': game tree search (see ai.py)
+AI_TIME_BUDGET = 0.008    # Seconds the 'hard' AI may think per move, so it never stalls a frame
+AI_CACHE_SIZE = 1024      # Attack categorisations (ability set, target element) kept by choose_smart_attack
+
+# Replays of finished battles (seed, team and player actions) for reproducing bug reports
+REPLAY_FOLDER = 'replays'  # Relative to the project folder, None to turn off
+
+# Rendering
+FPS = 60               # Frame rate cap (0 = uncapped)
+IDLE_FPS = 15          # Frame rate while nothing animates, e.g. waiting on a turn timer (0 = same as FPS)
+VSYNC = False          # Sync frames to the display's refresh rate where the video driver supports it
+ATLAS_PAGE_SIZE = 2048 # Width and height of the texture atlas pages images are packed into (see atlas.py)
+LOADER_THREADS = 4     # Threads decoding images and sounds at startup
+ASSET_CACHE = 'cache/assets.bin'  # Memory-mapped atlas pages, relative to the project folder (None to always decode)
+IMAGE_FOLDERS = ('back', 'front', 'other', 'simple')  # Folders of images/ loaded as single images
+# Layout and speed of the sprite sheets in images/attacks, frames are read left to right, top to bottom
+# - cols, rows: grid of equal cells the sheet is cut into
+# - frames: cells actually used (None = all of them, fewer for a part-filled last row)
+# - frame_duration: seconds each frame is shown
+ATTACK_SHEET_DEFAULT = {'cols': 4, 'rows': 1, 'frames': None, 'frame_duration': 0.2}
+ATTACK_SHEETS = {
+    'explosion': {'cols': 4, 'rows': 1, 'frames': 4, 'frame_duration': 0.2},
+    'fire': {'cols': 4, 'rows': 1, 'frames': 4, 'frame_duration': 0.2},
+    'green': {'cols': 4, 'rows': 1, 'frames': 4, 'frame_duration': 0.2},
+    'ice': {'cols': 4, 'rows': 1, 'frames': 4, 'frame_duration': 0.2},
+    'scratch': {'cols': 4, 'rows': 1, 'frames': 4, 'frame_duration': 0.2},
+    'splash': {'cols': 4, 'rows': 1, 'frames': 4, 'frame_duration': 0.2},
+}  # Sheets not listed use ATTACK_SHEET_DEFAULT
+ASSET_MEMORY_BUDGET = None        # Bytes of sound data kept between rounds, least recently used evicted first (None = keep all)
+TEXT_CACHE_SIZE = 512  # Rendered text surfaces kept by the shared text cache (see text.py)
+DIRTY_RECTS = False    # Battle screen repaints and flips only the areas that changed (for slow displays, see renderer.py)
+
+# Frame profiler (see profiler.py)
+PROFILER_FRAMES = 600               # Frames kept in the profiler's ring buffer
+PROFILER_OVERLAY_KEY = pygame.K_F3  # Toggles the frame time overlay
+PROFILER_TRACE_KEY = pygame.K_F4    # Saves the buffer as a Chrome trace
+PROFILER_FOLDER = 'traces'          # Relative to the project folder
@@ -0,0 +1,197 @@
+"""
+Vectorized Monte Carlo battle simulator (requires numpy)
+Advances many battles at once with the same rules as BattleEngine, with both sides
+picking attacks like choose_smart_attack. Run it directly for a quick win-rate report:
+
+    python simulation.py Verdian Sparkfin Splashfin Bugwort -n 100000
+"""
+from settings import *
+from tables import TABLES
+from time import perf_counter
+import numpy as np
+
+MAX_ATTACKS = 12  # Attack sets are bit masks with one bit per attack id; lookup tables grow as 2 ** attacks
+
+def bit_tables(bits):
+    """Popcount and position of the n-th set bit for every mask of the given width"""
+    masks = range(1 << bits)
+    set_bits = [[bit for bit in range(bits) if mask >> bit & 1] for mask in masks]
+    bit_count = np.array([len(positions) for positions in set_bits])
+    nth_bit = np.zeros((1 << bits, max(1, bits)), dtype = np.int64)
+    for mask, positions in enumerate(set_bits):
+        nth_bit[mask, :len(positions)] = positions
+    return bit_count, nth_bit
+
+class BatchSimulator:
+    """
+    Plays N battles as array operations
+    Health, team and ability arrays have one row per battle; finished battles are dropped each round
+    """
+    def __init__(self, tables = TABLES, seed = None):
+        """
+        - tables: BattleTables to simulate (build one from edited data to test balance changes)
+        - seed: seed for the numpy random generator (None for a random seed)
+        """
+        self.tables = tables
+        self.rng = np.random.default_rng(seed)
+
+        self.creature_element = np.array(tables.creature_element, dtype = np.int64)
+        self.creature_health = np.array(tables.creature_health, dtype = np.float64)
+        attack_damage = np.array(tables.attack_damage, dtype = np.float64)
+        multiplier = np.array(tables.element_multiplier, dtype = np.float64)
+
+        # [attack id, target element id] lookups used every round
+        attack_count = len(tables.attack_names)
+        if attack_count > MAX_ATTACKS:
+            raise ValueError(f'too many attacks for mask tables ({attack_count} > {MAX_ATTACKS})')
+        self.damage = attack_damage[:, None] * multiplier[tables.attack_element]
+        super_effective = multiplier[tables.attack_element] > 1.0
+        high_damage = (attack_damage >= 40)[:, None] & ~super_effective
+
+        # Attack sets as bit masks: every 4-attack combination, and per target element the
+        # attacks choose_smart_attack counts as super effective / high damage
+        bits = 1 << np.arange(attack_count)
+        self.attack_sets = np.array([mask for mask in range(1 << attack_count) if bin(mask).count('1') == 4])
+        self.effective_bits = (super_effective * bits[:, None]).sum(axis = 0)
+        self.high_bits = (high_damage * bits[:, None]).sum(axis = 0)
+        self.bit_count, self.nth_bit = bit_tables(attack_count)
+
+    def sample_abilities(self, shape):
+        """
+        Random attack set per creature, like random.sample in Creature.get_data
+        The order of the 4 attacks never matters to the rules, so a set is stored as one bit mask
+        """
+        return self.attack_sets[self.rng.integers(len(self.attack_sets), size = shape)]
+
+    def build_gauntlets(self, player_teams, size = OPPONENT_TEAM_SIZE):
+        """Opponent creature ids for every battle, avoiding the player's creatures like build_gauntlet"""
+        battles = len(player_teams)
+        creatures = len(self.tables.creature_names)
+        if creatures - player_teams.shape[1] < size:
+            # Small rosters allow duplicates in build_gauntlet; not worth vectorizing
+            raise ValueError('roster too small for a gauntlet without duplicates')
+        keys = self.rng.random((battles, creatures))
+        keys[np.arange(battles)[:, None], player_teams] = 2.0  # Sort the player's creatures last
+        return np.argsort(keys, axis = 1)[:, :size]
+
+    def choose_smart_attacks(self, abilities, target_elements):
+        """
+        Vectorized choose_smart_attack - returns one attack id per row
+        - abilities: (rows,) attack set masks of the attacking creatures
+        - target_elements: (rows,) element ids of the targets
+        """
+        effective = abilities & self.effective_bits[target_elements]
+        high = abilities & self.high_bits[target_elements]
+        normal = abilities & ~(effective | high)
+
+        # 60% chance for super effective, 30% for high damage, 10% for normal
+        rand, pick = self.rng.random((2, len(abilities)))
+        candidates = np.where((effective != 0) & (rand < 0.6), effective,
+                     np.where((high != 0) & (rand < 0.9), high,
+                     np.where(normal != 0, normal, abilities)))  # Fallback to any attack
+
+        # Uniform choice among the candidates
+        nth = (pick * self.bit_count[candidates]).astype(np.int64)
+        return self.nth_bit[candidates, nth]
+
+    def run(self, player_teams, opponent_teams = None, max_rounds = 10000):
+        """
+        Simulate one battle per row and return (wins, rounds)
+        - player_teams: (battles, TEAM_SIZE) creature ids
+        - opponent_teams: (battles, OPPONENT_TEAM_SIZE) creature ids, built randomly when not given
+        - wins: bool array, True where the player beat the whole gauntlet
+        - rounds: number of player turns each battle took
+        """
+        player_teams = np.asarray(player_teams, dtype = np.int64)
+        if opponent_teams is None:
+            opponent_teams = self.build_gauntlets(player_teams)
+        opponent_teams = np.asarray(opponent_teams, dtype = np.int64)
+        battles = len(player_teams)
+
+        player_health = self.creature_health[player_teams]
+        opponent_health = self.creature_health[opponent_teams]
+        player_elements = self.creature_element[player_teams]
+        opponent_elements = self.creature_element[opponent_teams]
+        player_abilities = self.sample_abilities(player_teams.shape)
+        opponent_abilities = self.sample_abilities(opponent_teams.shape)
+        player_index = np.zeros(battles, dtype = np.int64)
+        opponent_index = np.zeros(battles, dtype = np.int64)
+        last_opponent = opponent_teams.shape[1] - 1
+
+        live = np.arange(battles)  # Battle ids still running, rows of the state arrays
+        wins = np.zeros(battles, dtype = bool)
+        rounds = np.zeros(battles, dtype = np.int64)
+
+        for round_number in range(1, max_rounds + 1):
+            rows = np.arange(len(live))
+
+            # Player attacks the active opponent
+            target = opponent_elements[rows, opponent_index]
+            attacks = self.choose_smart_attacks(player_abilities[rows, player_index], target)
+            opponent_hp = np.maximum(0, opponent_health[rows, opponent_index] - self.damage[attacks, target])
+            opponent_health[rows, opponent_index] = opponent_hp
+
+            # Fainted opponents are replaced by the next one (or the player wins)
+            fainted = opponent_hp <= 0
+            won = fainted & (opponent_index == last_opponent)
+            opponent_index = np.where(fainted & ~won, opponent_index + 1, opponent_index)
+
+            # Surviving opponents hit back
+            attackers = rows[~fainted]
+            active = player_index[attackers]
+            target = player_elements[attackers, active]
+            attacks = self.choose_smart_attacks(opponent_abilities[attackers, opponent_index[attackers]], target)
+            player_health[attackers, active] = np.maximum(0, player_health[attackers, active] - self.damage[attacks, target])
+
+            # Fainted player creatures are replaced by the first healthy one (or the player loses)
+            standing = player_health > 0
+            down = ~standing[rows, player_index]
+            lost = down & ~standing.any(axis = 1)
+            player_index = np.where(down & ~lost, standing.argmax(axis = 1), player_index)
+
+            finished = won | lost
+            if finished.any():
+                wins[live[won]] = True
+                rounds[live[finished]] = round_number
+                keep = ~finished
+                live = live[keep]
+                if not len(live):
+                    break
+                player_health, opponent_health = player_health[keep], opponent_health[keep]
+                player_elements, opponent_elements = player_elements[keep], opponent_elements[keep]
+                player_abilities, opponent_abilities = player_abilities[keep], opponent_abilities[keep]
+                player_index, opponent_index = player_index[keep], opponent_index[keep]
+        rounds[live] = max_rounds
+        return wins, rounds
+
+    def team_ids(self, names):
+        """Creature ids for a list of creature names"""
+        return [self.tables.creature_ids[name] for name in names]
+
+def win_rate(team, battles = 100000, tables = TABLES, seed = None):
+    """Fraction of battles a team (list of creature names) wins against random gauntlets"""
+    simulator = BatchSimulator(tables, seed)
+    wins, _ = simulator.run(np.tile(simulator.team_ids(team), (battles, 1)))
+    return wins.mean()
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description = 'Simulate battles for one team against random gauntlets')
+    parser.add_argument('team', nargs = '*', help = f'{TEAM_SIZE} creature names (random teams when omitted)')
+    parser.add_argument('-n', '--battles', type = int, default = 100000)
+    parser.add_argument('--seed', type = int, default = None)
+    args = parser.parse_args()
+
+    simulator = BatchSimulator(seed = args.seed)
+    if args.team:
+        player_teams = np.tile(simulator.team_ids(args.team), (args.battles, 1))
+    else:
+        keys = simulator.rng.random((args.battles, len(TABLES.creature_names)))
+        player_teams = np.argsort(keys, axis = 1)[:, :TEAM_SIZE]
+
+    start = perf_counter()
+    wins, rounds = simulator.run(player_teams)
+    elapsed = perf_counter() - start
+    print(f'win rate: {wins.mean():.4f} over {args.battles} battles')
+    print(f'{rounds.sum()} turns in {elapsed:.3f}s ({rounds.sum() / elapsed:,.0f} turns/s)')
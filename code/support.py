@@ -1,54 +1,97 @@
 from settings import * 
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import os
 
-def folder_importer(*path):
-    surfs = {}
-    # Get the directory where this script is located
-    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    full_path = join(base_dir, *path)
-    
-    for folder_path, _, file_names in walk(full_path):
-        for file_name in file_names:
-            file_path = join(folder_path, file_name)
-            try:
-                surfs[file_name.split('.')[0]] = pygame.image.load(file_path).convert_alpha()
-            except pygame.error as e:
-                print(f"Warning: Could not load image {file_name}: {e}")
-    return surfs
-
-def audio_importer(*path):
-    audio_dict = {}
-    # Get the directory where this script is located
-    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    full_path = join(base_dir, *path)
-    
-    for folder_path, _, file_names in walk(full_path):
-        for file_name in file_names:
-            file_path = join(folder_path, file_name)
-            try:
-                audio_dict[file_name.split('.')[0]] = pygame.mixer.Sound(file_path)
-            except pygame.error as e:
-                print(f"Warning: Could not load audio file {file_name}: {e}")
-    return audio_dict
-
-def tile_importer(cols, *path):
-    attack_frames = {}
-    # Get the directory where this script is located
-    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    full_path = join(base_dir, *path)
-    
-    for folder_path, _, file_names in walk(full_path):
-        for file_name in file_names:
-            file_path = join(folder_path, file_name)
-            try:
-                surf = pygame.image.load(file_path).convert_alpha()
-                attack_frames[file_name.split('.')[0]] = []
-                cutout_width = surf.get_width() / cols
-                for col in range(cols):
-                    cutout_surf = pygame.Surface((cutout_width, surf.get_height()), pygame.SRCALPHA)
-                    cutout_rect = pygame.Rect(cutout_width * col,0,cutout_width,surf.get_height())
-                    cutout_surf.blit(surf, (0,0),cutout_rect)
-                    attack_frames[file_name.split('.')[0]].append(cutout_surf)
-            except pygame.error as e:
-                print(f"Warning: Could not load attack animation {file_name}: {e}")
-    return attack_frames
\ No newline at end of file
+def sheet_layout(name, sheets = ATTACK_SHEETS):
+    """Layout of one sprite sheet: its entry in `sheets` over ATTACK_SHEET_DEFAULT"""
+    return {**ATTACK_SHEET_DEFAULT, **sheets.get(name, {})}
+
+def slice_frames(surf, cols = 4, rows = 1, frames = None, frame_duration = None):
+    """
+    Cut a sprite sheet into frames, left to right and top to bottom
+    Frames are subsurfaces sharing the sheet's pixels, nothing is copied.
+    - cols, rows: grid of equal cells (leftover pixels past the last full cell are ignored)
+    - frames: cells used, None for all of them
+    - frame_duration: unused here, accepted so a whole sheet_layout can be passed in
+    """
+    width, height = surf.get_width() // cols, surf.get_height() // rows
+    count = cols * rows if frames is None else min(frames, cols * rows)
+    return [surf.subsurface((index % cols * width, index // cols * height, width, height)) for index in range(count)]
+
+def slice_sheets(surfs, sheets = ATTACK_SHEETS):
+    """Cut every sheet of a {name: sheet} dict, returns {name: [frames]}"""
+    return {name: slice_frames(surf, **sheet_layout(name, sheets)) for name, surf in surfs.items()}
+
+class AssetLoader:
+    """
+    Loads many asset folders at once: files are decoded on a thread pool (pygame releases
+    the GIL while decoding), while convert_alpha stays on the main thread where the display
+    lives. Queue folders with images/sounds, then call load(), or
+    start() to decode in the background and load() later to collect the results.
+    """
+    def __init__(self, workers = LOADER_THREADS):
+        self.workers = workers
+        self.jobs = []  # (kind, group, name, file path)
+        self.groups = []
+        self.files = {}  # group -> {name: file path} of everything queued, e.g. to reload a sound later
+        self.pool = None
+        self.futures = {}  # Decoding future -> job, once started
+
+    def queue(self, kind, group, path):
+        if group not in self.groups:
+            self.groups.append(group)
+        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        for folder_path, _, file_names in walk(join(base_dir, *path)):
+            for file_name in file_names:
+                self.jobs.append((kind, group, file_name.split('.')[0], join(folder_path, file_name)))
+                self.files.setdefault(group, {})[file_name.split('.')[0]] = join(folder_path, file_name)
+
+    def images(self, group, *path):
+        """Queue a folder of images, converted for the display once loaded"""
+        self.queue('image', group, path)
+
+    def sounds(self, group, *path):
+        """Queue a folder of sounds"""
+        self.queue('sound', group, path)
+
+    @staticmethod
+    def decode(job):
+        """Worker thread: read and decode one file"""
+        kind, _, _, file_path = job
+        if kind == 'sound':
+            return pygame.mixer.Sound(file_path)
+        return pygame.image.load(file_path)
+
+    def start(self):
+        """Start decoding the queued files on the thread pool and return without waiting"""
+        if self.pool is None:
+            self.pool = ThreadPoolExecutor(max_workers = self.workers)
+            self.futures = {self.pool.submit(self.decode, job): job for job in self.jobs}
+        return self
+
+    def finished(self):
+        """Whether every queued file has been decoded (load() then returns without waiting on the pool)"""
+        return self.pool is not None and all(future.done() for future in self.futures)
+
+    def load(self, progress = None):
+        """
+        Load every queued file and return {group: {name: asset}}, waiting for any still decoding
+        - progress: called on the main thread as progress(done, total) after each file
+        """
+        assets = {group: {} for group in self.groups}
+        total = len(self.jobs)
+        with self.start().pool:
+            for done, future in enumerate(as_completed(self.futures), 1):
+                kind, group, name, file_path = self.futures[future]
+                try:
+                    asset = future.result()
+                    if kind == 'image':
+                        asset = asset.convert_alpha()
+                    assets[group][name] = asset
+                except pygame.error as e:
+                    print(f"Warning: Could not load {kind} {os.path.basename(file_path)}: {e}")
+                if progress is not None:
+                    progress(done, total)
+        self.jobs, self.groups = [], []
+        self.pool, self.futures = None, {}
+        return assets
\ No newline at end of file
@@ -0,0 +1,58 @@
+from settings import *
+from itertools import combinations
+
+# Categories choose_smart_attack sorts an attack into against a target element
+SUPER_EFFECTIVE, HIGH_DAMAGE, NORMAL = 0, 1, 2
+
+class BattleTables:
+    """
+    Integer-indexed copy of the creature, attack and element tables in settings.py
+    Names become small ids so simulations can index flat lists (or arrays) instead of nested dicts
+    """
+    def __init__(self, creature_data = CREATURE_DATA, attack_data = ATTACK_DATA, element_data = ELEMENT_DATA):
+        """
+        - creature_data, attack_data, element_data: tables shaped like the ones in settings.py
+          (pass modified copies to try out balance changes without editing settings)
+        """
+        # id -> name
+        self.creature_names = list(creature_data.keys())
+        self.attack_names = list(attack_data.keys())
+        self.element_names = list(element_data.keys())
+
+        # name -> id
+        self.creature_ids = {name: index for index, name in enumerate(self.creature_names)}
+        self.attack_ids = {name: index for index, name in enumerate(self.attack_names)}
+        self.element_ids = {name: index for index, name in enumerate(self.element_names)}
+
+        # Per creature id
+        self.creature_element = [self.element_ids[creature_data[name]['element']] for name in self.creature_names]
+        self.creature_health = [creature_data[name]['health'] for name in self.creature_names]
+
+        # Per attack id
+        self.attack_element = [self.element_ids[attack_data[name]['element']] for name in self.attack_names]
+        self.attack_damage = [attack_data[name]['damage'] for name in self.attack_names]
+
+        # [attack element id][target element id] -> damage multiplier
+        self.element_multiplier = [[element_data[attacker][defender] for defender in self.element_names] for attacker in self.element_names]
+
+        # [attack id][target creature id] -> final damage (base damage × type effectiveness)
+        self.damage = [[self.attack_damage[attack] * self.element_multiplier[self.attack_element[attack]][self.creature_element[creature]]
+                        for creature in range(len(self.creature_names))] for attack in range(len(self.attack_names))]
+
+        # Every set of 4 attacks a creature can roll, by set id (sorted attack ids and their names)
+        self.ability_sets = list(combinations(range(len(self.attack_names)), 4))
+        self.ability_set_names = [tuple(self.attack_names[attack] for attack in attacks) for attacks in self.ability_sets]
+
+        # [attack id][target element id] -> SUPER_EFFECTIVE, HIGH_DAMAGE or NORMAL
+        self.attack_category = [[self.categorize(attack, element) for element in range(len(self.element_names))]
+                                for attack in range(len(self.attack_names))]
+
+    def categorize(self, attack, element):
+        """How choose_smart_attack ranks an attack id against a target element id"""
+        if self.element_multiplier[self.attack_element[attack]][element] > 1.0:
+            return SUPER_EFFECTIVE
+        if self.attack_damage[attack] >= 40:
+            return HIGH_DAMAGE
+        return NORMAL
+
+TABLES = BattleTables()  # Compiled once from settings.py
@@ -0,0 +1,98 @@
+"""
+Shared fonts, rendered text and text layout
+Fonts are pooled by (file, size) and rendered strings are kept in one LRU cache, so a label
+drawn every frame is rasterised once instead of every frame. Fitting and wrapping measure
+with Font.size and memoize their results, so they cost nothing after the first frame.
+"""
+from settings import *
+from collections import OrderedDict
+from functools import lru_cache
+
+FONTS = {}  # (font file, size) -> pygame Font, shared by every UI class
+
+def get_font(size, name = None):
+    """Shared Font for a font file (None = pygame's default font) and size"""
+    key = (name, size)
+    if key not in FONTS:
+        FONTS[key] = pygame.font.Font(name, size)
+    return FONTS[key]
+
+class TextCache:
+    """
+    Rendered text surfaces keyed by (font file, size, text, colour, antialias)
+    The least recently used surface is dropped once the cache is full. Callers must not
+    draw on the returned surfaces, since they are shared.
+    """
+    def __init__(self, max_size = TEXT_CACHE_SIZE):
+        self.max_size = max_size
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, text, size, color, antialias = True, name = None):
+        """Surface of a string, rendered on the first request only"""
+        # pygame Colors are not hashable
+        key = (name, size, text, color if isinstance(color, (str, tuple)) else tuple(color), antialias)
+        surf = self.surfaces.get(key)
+        if surf is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surf
+
+        self.misses += 1
+        surf = get_font(size, name).render(text, antialias, color)
+        self.surfaces[key] = surf
+        if len(self.surfaces) > self.max_size:
+            self.surfaces.popitem(last = False)
+        return surf
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def clear(self):
+        self.surfaces.clear()
+        self.hits = self.misses = 0
+
+TEXT_CACHE = TextCache()
+
+def render_text(text, size, color, antialias = True, name = None):
+    """Render through the shared text cache"""
+    return TEXT_CACHE.render(text, size, color, antialias, name)
+
+@lru_cache(maxsize = TEXT_CACHE_SIZE)
+def fit_text(text, max_width, font_size = 24, min_size = 14):
+    """
+    Largest font size (stepping down by 2) at which text fits max_width, as (size, text)
+    If even that is too wide, the text is cut short with "..." at min_size
+    """
+    for size in range(font_size, 12, -2):
+        if get_font(size).size(text)[0] <= max_width:
+            return size, text
+
+    # If still too long, truncate
+    font = get_font(min_size)
+    while len(text) > 0:
+        if font.size(text + "...")[0] <= max_width:
+            return min_size, text + "..."
+        text = text[:-1]
+    return min_size, "..."
+
+@lru_cache(maxsize = TEXT_CACHE_SIZE)
+def wrap_text(text, max_width, font_size = 20):
+    """Split text into lines no wider than max_width (a single long word gets its own line), as (size, lines)"""
+    font = get_font(font_size)
+    lines = []
+    current_line = ""
+    for word in text.split(' '):
+        test_line = current_line + " " + word if current_line else word
+        if font.size(test_line)[0] <= max_width:
+            current_line = test_line
+        else:
+            if current_line:
+                lines.append(current_line)
+            current_line = word
+    if current_line:
+        lines.append(current_line)
+    return font_size, tuple(lines)
@@ -24,8 +24,46 @@ class Timer:
 		if self.repeat:
 			self.activate()
 
+	def elapsed(self):
+		"""Milliseconds since an active timer started (0 when inactive)"""
+		return pygame.time.get_ticks() - self.start_time if self.active else 0
+
+	def resume(self, elapsed):
+		"""Activate the timer as if it had started `elapsed` milliseconds ago"""
+		self.activate()
+		self.start_time -= elapsed
+
 	def update(self):
 		if self.active:
 			if pygame.time.get_ticks() - self.start_time >= self.duration:
 				if self.func and self.start_time != 0: self.func()
-				self.deactivate()
\ No newline at end of file
+				self.deactivate()
+
+class FramePacer:
+	"""
+	Frame limiter for the main loop
+	Caps the frame rate at FPS and drops to IDLE_FPS while nothing on screen animates, so
+	several game instances on one machine don't each spin a CPU core (0 or None = uncapped)
+	"""
+	def __init__(self, fps = FPS, idle_fps = IDLE_FPS, vsync = VSYNC):
+		self.fps = fps
+		self.idle_fps = idle_fps
+		self.vsync = vsync
+		self.clock = pygame.time.Clock()
+
+	def set_mode(self, size):
+		"""Open the window, synced to the display's refresh rate when vsync is on and supported"""
+		if self.vsync:
+			try:
+				return pygame.display.set_mode(size, pygame.SCALED, vsync = 1)
+			except pygame.error:
+				pass  # No vsync on this driver, the FPS cap still applies
+		return pygame.display.set_mode(size)
+
+	def tick(self, idle = False):
+		"""Wait for the next frame and return the seconds since the previous one"""
+		fps = self.idle_fps if idle and self.idle_fps else self.fps
+		return self.clock.tick(fps or 0) / 1000
+
+	def get_fps(self):
+		return self.clock.get_fps()
@@ -0,0 +1,88 @@
+"""
+Round-robin balance tournament
+Plays every team the selection screen allows against random gauntlets on all CPU cores:
+
+    python tournament.py --gauntlets 200 --output balance.json
+"""
+from settings import *
+from battle import BattleEngine
+from itertools import combinations
+from multiprocessing import Pool
+from array import array
+from time import perf_counter
+import random
+import json
+
+def all_teams():
+    """Every team CreatureSelection allows: any TEAM_SIZE different creatures, in roster order"""
+    return list(combinations(CREATURE_DATA.keys(), TEAM_SIZE))
+
+def play_chunk(job):
+    """
+    Worker: play a slice of the teams and send back only win counters
+    - job: (first team index, number of teams, gauntlets per team, seed)
+    """
+    first, count, gauntlets, seed = job
+    rng = random.Random(seed)
+    teams = all_teams()[first:first + count]
+    wins = array('I', bytes(4 * count))
+    for index, team in enumerate(teams):
+        for _ in range(gauntlets):
+            if BattleEngine(team, rng = rng).run() == 'win':
+                wins[index] += 1
+    return first, wins
+
+def run_tournament(gauntlets = 100, processes = None, seed = 0, chunk_size = 16):
+    """
+    Play every team against `gauntlets` random gauntlets and return (teams, wins per team)
+    Each chunk has its own seed, so results don't depend on the number of processes
+    """
+    teams = all_teams()
+    jobs = [(first, min(chunk_size, len(teams) - first), gauntlets, seed * 1000003 + first)
+            for first in range(0, len(teams), chunk_size)]
+    wins = [0] * len(teams)
+    with Pool(processes) as pool:
+        for first, chunk_wins in pool.imap_unordered(play_chunk, jobs):
+            wins[first:first + len(chunk_wins)] = chunk_wins
+    return teams, wins
+
+def creature_win_rates(teams, wins, gauntlets):
+    """Average win rate of the teams each creature appears in"""
+    totals = {name: [0, 0] for name in CREATURE_DATA.keys()}
+    for team, team_wins in zip(teams, wins):
+        for name in team:
+            totals[name][0] += team_wins
+            totals[name][1] += gauntlets
+    return {name: won / played for name, (won, played) in totals.items() if played}
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description = 'Play every possible team against random gauntlets')
+    parser.add_argument('-g', '--gauntlets', type = int, default = 100, help = 'battles per team')
+    parser.add_argument('-p', '--processes', type = int, default = None, help = 'worker processes (all cores by default)')
+    parser.add_argument('--seed', type = int, default = 0)
+    parser.add_argument('--output', help = 'write the results to a JSON file')
+    args = parser.parse_args()
+
+    start = perf_counter()
+    teams, wins = run_tournament(args.gauntlets, args.processes, args.seed)
+    elapsed = perf_counter() - start
+    rates = creature_win_rates(teams, wins, args.gauntlets)
+
+    print(f'{len(teams)} teams x {args.gauntlets} gauntlets in {elapsed:.1f}s')
+    print('Creature win rates:')
+    for name, rate in sorted(rates.items(), key = lambda item: item[1], reverse = True):
+        print(f'  {name:<14}{rate:.3f}')
+    ranked = sorted(zip(wins, teams), reverse = True)
+    print('Best team: ', ', '.join(ranked[0][1]), f'({ranked[0][0] / args.gauntlets:.3f})')
+    print('Worst team:', ', '.join(ranked[-1][1]), f'({ranked[-1][0] / args.gauntlets:.3f})')
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump({
+                'gauntlets': args.gauntlets,
+                'seed': args.seed,
+                'creatures': rates,
+                'teams': [{'team': list(team), 'wins': team_wins} for team, team_wins in zip(teams, wins)],
+            }, file, indent = 2)
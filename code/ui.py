@@ -1,15 +1,20 @@
 from settings import *
+from render_cache import PANELS, SELECTION_BACKGROUND
+from text import get_font, render_text, fit_text, wrap_text
 import math 
 
 class UI:
-    def __init__(self, monster, player_monsters, simple_surfs, get_input):
+    def __init__(self, monster, player_monsters, portraits, get_input):
         self.display_surface = pygame.display.get_surface()
-        self.font = pygame.font.Font(None, 28)
-        self.large_font = pygame.font.Font(None, 36)
+        self.font_size = 28
+        self.large_font_size = 36
         self.left = WINDOW_WIDTH / 2 - 120 
         self.top = WINDOW_HEIGHT / 2 + 60
+        self.menu_rect = pygame.Rect(self.left + 40, self.top + 60, 450, 220)  # General and attack menus
+        self.stats_rect = pygame.Rect(self.left, self.top, 250, 80)             # Active creature's name and health
         self.monster = monster
-        self.simple_surfs = simple_surfs
+        self.portraits = portraits  # PortraitCache shared with the selection screen
+        self.portrait_size = 40
         self.get_input_callback = get_input
 
         # control 
@@ -22,6 +27,7 @@ class UI:
         self.player_monsters = player_monsters
         self.available_monsters = [monster for monster in self.player_monsters if monster != self.monster and monster.health > 0]
         self.switch_index = 0
+        self.portraits.warm([self.portrait_size], [monster.name for monster in player_monsters])
         
         # Animation variables
         self.pulse_timer = 0
@@ -115,16 +121,10 @@ class UI:
         self.pulse_timer += 0.05
         
         # Main menu background with gradient
-        rect = pygame.Rect(self.left + 40, self.top + 60, 450, 220)
+        rect = self.menu_rect
         
-        # Create gradient background
-        bg_surf = pygame.Surface((rect.width, rect.height), pygame.SRCALPHA)
-        for y in range(rect.height):
-            alpha = 200 - (y * 50 // rect.height)
-            color = (40, 40, 80, alpha)
-            pygame.draw.line(bg_surf, color, (0, y), (rect.width, y))
-        
-        self.display_surface.blit(bg_surf, rect.topleft)
+        # Gradient background
+        self.display_surface.blit(PANELS.gradient(rect.size, (40, 40, 80), 200, 50), rect.topleft)
         pygame.draw.rect(self.display_surface, (100, 150, 255), rect, 3, 8)
 
         # menu with enhanced styling
@@ -142,9 +142,7 @@ class UI:
                 
                 if is_selected:
                     # Animated glow for selected item
-                    glow_color = (255, 255, 100, 100 + int(50 * math.sin(self.pulse_timer * 3)))
-                    glow_surf = pygame.Surface((btn_width + 20, btn_height + 10), pygame.SRCALPHA)
-                    pygame.draw.rect(glow_surf, glow_color, (0, 0, btn_width + 20, btn_height + 10), border_radius=8)
+                    glow_surf = PANELS.glow((btn_width + 20, btn_height + 10), (255, 255, 100), self.pulse_timer)
                     self.display_surface.blit(glow_surf, (btn_rect.x - 10, btn_rect.y - 5))
                 
                 # Button background
@@ -154,7 +152,7 @@ class UI:
 
                 # Text
                 text_color = (255, 255, 255) if is_selected else (200, 200, 200)
-                text_surf = self.font.render(options[i], True, text_color)
+                text_surf = render_text(options[i], self.font_size, text_color)
                 text_rect = text_surf.get_rect(center=(x, y))
                 self.display_surface.blit(text_surf, text_rect)
 
@@ -164,17 +162,11 @@ class UI:
         rect = pygame.Rect(self.left + 40, self.top - 140, 450, 420)
         
         # Gradient background
-        bg_surf = pygame.Surface((rect.width, rect.height), pygame.SRCALPHA)
-        for y in range(rect.height):
-            alpha = 220 - (y * 60 // rect.height)
-            color = (30, 60, 30, alpha)
-            pygame.draw.line(bg_surf, color, (0, y), (rect.width, y))
-        
-        self.display_surface.blit(bg_surf, rect.topleft)
+        self.display_surface.blit(PANELS.gradient(rect.size, (30, 60, 30), 220, 60), rect.topleft)
         pygame.draw.rect(self.display_surface, (100, 255, 150), rect, 3, 8)
         
         # Title
-        title_surf = self.large_font.render("🔄 Switch Creature", True, (255, 255, 255))
+        title_surf = render_text("🔄 Switch Creature", self.large_font_size, (255, 255, 255))
         title_rect = title_surf.get_rect(center=(rect.centerx, rect.top + 30))
         self.display_surface.blit(title_surf, title_rect)
 
@@ -196,44 +188,33 @@ class UI:
                 pygame.draw.rect(self.display_surface, (255, 255, 100), card_rect, 3, 10)
             
             # Creature portrait
-            image_key = CREATURE_IMAGE_MAP.get(creature.name, creature.name)
-            if image_key in self.simple_surfs:
-                portrait = pygame.transform.scale(self.simple_surfs[image_key], (40, 40))
+            portrait = self.portraits.get(creature.name, self.portrait_size)
+            if portrait is not None:
                 portrait_rect = portrait.get_rect(center=(x - 120, y))
                 self.display_surface.blit(portrait, portrait_rect)
               # Creature info with fitted text
             text_color = (255, 255, 255) if is_selected else (200, 200, 200)
-            fitted_font, fitted_name = self.fit_text_to_box(creature.name, 180, 24)  # Max width 180px
-            name_surf = fitted_font.render(fitted_name, True, text_color)
+            fitted_size, fitted_name = fit_text(creature.name, 180, 24)  # Max width 180px
+            name_surf = render_text(fitted_name, fitted_size, text_color)
             name_rect = name_surf.get_rect(center=(x - 40, y - 10))
             self.display_surface.blit(name_surf, name_rect)
             
             # Health bar
-            hp_text = f"HP: {creature.health}/{creature.max_health}"
-            hp_surf = pygame.font.Font(None, 20).render(hp_text, True, text_color)
+            hp_text = f"HP: {creature.health:.0f}/{creature.max_health:.0f}"
+            hp_surf = render_text(hp_text, 20, text_color)
             hp_rect = hp_surf.get_rect(center=(x - 40, y + 10))
             self.display_surface.blit(hp_surf, hp_rect)
-            name = self.available_monsters[i].name
-
-            simple_surf = self.simple_surfs[CREATURE_IMAGE_MAP[name]]  # Use mapping to get correct image
-            simple_rect = simple_surf.get_rect(center = (x - 100, y))
-
-            text_surf = self.font.render(name, True, color)
-            text_rect = text_surf.get_rect(midleft = (x,y))
-            if rect.collidepoint(text_rect.center):
-                self.display_surface.blit(text_surf, text_rect)
-                self.display_surface.blit(simple_surf, simple_rect)
 
     def stats(self):
         # bg 
-        rect = pygame.Rect(self.left, self.top, 250, 80)
+        rect = self.stats_rect
         pygame.draw.rect(self.display_surface, COLORS['white'],rect, 0, 4)
         pygame.draw.rect(self.display_surface, COLORS['gray'],rect, 4, 4)
         
         # data with fitted text
         name_width = rect.width * 0.9  # Use 90% of rect width
-        fitted_font, fitted_name = self.fit_text_to_box(self.monster.name, name_width, 28)
-        name_surf = fitted_font.render(fitted_name, True, COLORS['black'])
+        fitted_size, fitted_name = fit_text(self.monster.name, name_width, 28)
+        name_surf = render_text(fitted_name, fitted_size, COLORS['black'])
         name_rect = name_surf.get_rect(topleft = rect.topleft + pygame.Vector2(rect.width * 0.05, 12))
         self.display_surface.blit(name_surf, name_rect)
 
@@ -251,6 +232,12 @@ class UI:
         self.input()
         self.available_monsters = [monster for monster in self.player_monsters if monster!= self.monster and monster.health > 0]
 
+    def bounds(self):
+        """Screen area draw() paints in the current state (for the dirty-rect renderer)"""
+        if self.state == 'switch':
+            return self.display_surface.get_rect()  # Creature cards can scroll past the panel
+        return self.menu_rect.union(self.stats_rect)
+
     def draw(self):
         if self.state == 'general': 
             self.draw_general_menu()
@@ -290,16 +277,10 @@ class UI:
         self.pulse_timer += 0.05
         
         # Main menu background with gradient
-        rect = pygame.Rect(self.left + 40, self.top + 60, 450, 220)
-        
-        # Create gradient background
-        bg_surf = pygame.Surface((rect.width, rect.height), pygame.SRCALPHA)
-        for y in range(rect.height):
-            alpha = 200 - (y * 50 // rect.height)
-            color = (40, 40, 80, alpha)
-            pygame.draw.line(bg_surf, color, (0, y), (rect.width, y))
+        rect = self.menu_rect
         
-        self.display_surface.blit(bg_surf, rect.topleft)
+        # Gradient background
+        self.display_surface.blit(PANELS.gradient(rect.size, (40, 40, 80), 200, 50), rect.topleft)
         pygame.draw.rect(self.display_surface, (100, 150, 255), rect, 3, 8)
 
         # Draw menu options
@@ -319,9 +300,7 @@ class UI:
                     
                     if is_selected:
                         # Animated glow for selected item
-                        glow_color = (255, 255, 100, 100 + int(50 * math.sin(self.pulse_timer * 3)))
-                        glow_surf = pygame.Surface((btn_width + 20, btn_height + 10), pygame.SRCALPHA)
-                        pygame.draw.rect(glow_surf, glow_color, (0, 0, btn_width + 20, btn_height + 10), border_radius=8)
+                        glow_surf = PANELS.glow((btn_width + 20, btn_height + 10), (255, 255, 100), self.pulse_timer)
                         self.display_surface.blit(glow_surf, (btn_rect.x - 10, btn_rect.y - 5))
                     
                     # Button background
@@ -329,8 +308,8 @@ class UI:
                     pygame.draw.rect(self.display_surface, btn_color, btn_rect, border_radius=8)
                     pygame.draw.rect(self.display_surface, (200, 200, 200), btn_rect, 2, 8)                    # Text with automatic sizing
                     text_color = (255, 255, 255) if is_selected else (200, 200, 200)
-                    fitted_font, fitted_text = self.fit_text_to_box(self.general_options[i], btn_width - 10, 24)
-                    text_surf = fitted_font.render(fitted_text, True, text_color)
+                    fitted_size, fitted_text = fit_text(self.general_options[i], btn_width - 10, 24)
+                    text_surf = render_text(fitted_text, fitted_size, text_color)
                     text_rect = text_surf.get_rect(center=(x, y))
                     self.display_surface.blit(text_surf, text_rect)
 
@@ -339,16 +318,10 @@ class UI:
         self.pulse_timer += 0.05
         
         # Attack menu background with gradient
-        rect = pygame.Rect(self.left + 40, self.top + 60, 450, 220)
-        
-        # Create gradient background
-        bg_surf = pygame.Surface((rect.width, rect.height), pygame.SRCALPHA)
-        for y in range(rect.height):
-            alpha = 220 - (y * 60 // rect.height)
-            color = (60, 20, 20, alpha)
-            pygame.draw.line(bg_surf, color, (0, y), (rect.width, y))
+        rect = self.menu_rect
         
-        self.display_surface.blit(bg_surf, rect.topleft)
+        # Gradient background
+        self.display_surface.blit(PANELS.gradient(rect.size, (60, 20, 20), 220, 60), rect.topleft)
         pygame.draw.rect(self.display_surface, (200, 100, 100), rect, 3, 8)
 
         # Draw attack options
@@ -370,9 +343,7 @@ class UI:
                     
                     if is_selected:
                         # Animated glow for selected item
-                        glow_color = (255, 100, 100, 100 + int(50 * math.sin(self.pulse_timer * 3)))
-                        glow_surf = pygame.Surface((btn_width + 20, btn_height + 10), pygame.SRCALPHA)
-                        pygame.draw.rect(glow_surf, glow_color, (0, 0, btn_width + 20, btn_height + 10), border_radius=8)
+                        glow_surf = PANELS.glow((btn_width + 20, btn_height + 10), (255, 100, 100), self.pulse_timer)
                         self.display_surface.blit(glow_surf, (btn_rect.x - 10, btn_rect.y - 5))
                     
                     # Button background with element color
@@ -389,112 +360,65 @@ class UI:
                     pygame.draw.rect(self.display_surface, btn_color, btn_rect, border_radius=8)
                     pygame.draw.rect(self.display_surface, (200, 200, 200), btn_rect, 2, 8)                    # Attack text with automatic sizing and wrapping
                     text_color = (255, 255, 255) if is_selected else (200, 200, 200)
-                    wrap_font, text_lines = self.wrap_text(attack_info, btn_width - 10, 18)
+                    wrap_size, text_lines = wrap_text(attack_info, btn_width - 10, 18)
                     
                     # Draw multiple lines if needed
-                    line_height = wrap_font.get_height()
+                    line_height = get_font(wrap_size).get_height()
                     total_height = len(text_lines) * line_height
                     start_y = y - (total_height // 2)
                     
                     for idx, line in enumerate(text_lines):
-                        text_surf = wrap_font.render(line, True, text_color)
+                        text_surf = render_text(line, wrap_size, text_color)
                         text_rect = text_surf.get_rect(center=(x, start_y + idx * line_height))
                         self.display_surface.blit(text_surf, text_rect)
 
-    def fit_text_to_box(self, text, max_width, font_size=24):
-        """Fit text to a specific width by adjusting font size or truncating"""
-        # Try different font sizes
-        for size in range(font_size, 12, -2):  # Start from font_size, go down to 12
-            test_font = pygame.font.Font(None, size)
-            text_surf = test_font.render(text, True, (255, 255, 255))
-            if text_surf.get_width() <= max_width:
-                return test_font, text
-        
-        # If still too long, truncate text
-        small_font = pygame.font.Font(None, 14)
-        while len(text) > 0:
-            text_surf = small_font.render(text + "...", True, (255, 255, 255))
-            if text_surf.get_width() <= max_width:
-                return small_font, text + "..."
-            text = text[:-1]
-        
-        return small_font, "..."
-
-    def wrap_text(self, text, max_width, font_size=20):
-        """Wrap text to multiple lines if needed"""
-        font = pygame.font.Font(None, font_size)
-        words = text.split(' ')
-        lines = []
-        current_line = ""
-        
-        for word in words:
-            test_line = current_line + " " + word if current_line else word
-            test_surf = font.render(test_line, True, (255, 255, 255))
-            
-            if test_surf.get_width() <= max_width:
-                current_line = test_line
-            else:
-                if current_line:
-                    lines.append(current_line)
-                current_line = word
-        
-        if current_line:
-            lines.append(current_line)
-        
-        return font, lines
-
 class OpponentUI:
     def __init__(self, monster, opponent_index=0, total_opponents=4):
         self.display_surface = pygame.display.get_surface()
         self.monster = monster
-        self.font = pygame.font.Font(None, 30)
-        self.small_font = pygame.font.Font(None, 20)
+        self.font_size = 30
+        self.small_font_size = 20
         self.opponent_index = opponent_index
         self.total_opponents = total_opponents
     
-    def fit_text_to_box(self, text, max_width, font_size=30):
-        """Fit text to a specific width by adjusting font size"""
-        for size in range(font_size, 12, -2):
-            test_font = pygame.font.Font(None, size)
-            text_surf = test_font.render(text, True, COLORS['black'])
-            if text_surf.get_width() <= max_width:
-                return test_font, text
-        
-        # If still too long, truncate
-        small_font = pygame.font.Font(None, 14)
-        while len(text) > 0:
-            text_surf = small_font.render(text + "...", True, COLORS['black'])
-            if text_surf.get_width() <= max_width:
-                return small_font, text + "..."
-            text = text[:-1]
-        
-        return small_font, "..."
-    
-    def draw(self):
-        # bg 
+    def layout(self):
+        """Box, fitted name text and rects of the name, team line and health bar, as draw() places them"""
         rect = pygame.Rect((0,0), (250,100))  # Made slightly taller for team info
         rect.midleft = (500, self.monster.rect.centery)
-        pygame.draw.rect(self.display_surface, COLORS['white'],rect, 0, 4)
-        pygame.draw.rect(self.display_surface, COLORS['gray'],rect, 4, 4)
 
         # name with fitted text
         name_width = rect.width * 0.9  # Use 90% of rect width
-        fitted_font, fitted_name = self.fit_text_to_box(self.monster.name, name_width, 30)
-        name_surf = fitted_font.render(fitted_name, True, COLORS['black'])
+        fitted_size, fitted_name = fit_text(self.monster.name, name_width, self.font_size)
+        name_surf = render_text(fitted_name, fitted_size, COLORS['black'])
         name_rect = name_surf.get_rect(topleft = rect.topleft + pygame.Vector2(rect.width * 0.05, 8))
-        self.display_surface.blit(name_surf, name_rect)        # Team progress indicator
-        team_text = f"Opponent {self.opponent_index + 1}/{self.total_opponents}"
-        team_surf = self.small_font.render(team_text, True, COLORS['black'])
+        # Team progress indicator
+        team_surf = render_text(self.team_text(), self.small_font_size, COLORS['black'])
         team_rect = team_surf.get_rect(topleft = rect.topleft + pygame.Vector2(rect.width * 0.05, name_rect.bottom + 2))
-        self.display_surface.blit(team_surf, team_rect)
-        
+
         # health bar - positioned inside the box
         health_rect = pygame.Rect(name_rect.left, team_rect.bottom + 5, rect.width * 0.9, 15)
         # Ensure health bar stays inside the box
         max_right = rect.right - 12  # Leave some margin from box edge
         if health_rect.right > max_right:
             health_rect.width = max_right - health_rect.left
-        
+        return rect, name_surf, name_rect, team_surf, team_rect, health_rect
+
+    def team_text(self):
+        return f"Opponent {self.opponent_index + 1}/{self.total_opponents}"
+
+    def panel_rect(self):
+        """Screen area draw() paints: the box and the team line and health bar hanging below it"""
+        rect, _, name_rect, _, team_rect, health_rect = self.layout()
+        return rect.unionall([name_rect, team_rect, health_rect])
+
+    def draw(self):
+        # bg 
+        rect, name_surf, name_rect, team_surf, team_rect, health_rect = self.layout()
+        pygame.draw.rect(self.display_surface, COLORS['white'],rect, 0, 4)
+        pygame.draw.rect(self.display_surface, COLORS['gray'],rect, 4, 4)
+        self.display_surface.blit(name_surf, name_rect)
+        self.display_surface.blit(team_surf, team_rect)
+
         pygame.draw.rect(self.display_surface, COLORS['gray'], health_rect)
         ratio = health_rect.width / self.monster.max_health
         progress_rect = pygame.Rect(health_rect.topleft, (self.monster.health * ratio, health_rect.height))
@@ -505,12 +429,12 @@ class CreatureSelection:
     Enhanced creature selection screen - allows player to choose 4 creatures from all available
     Features attractive UI with animations, gradients, and visual effects
     """
-    def __init__(self, simple_surfs):
+    def __init__(self, portraits):
         self.display_surface = pygame.display.get_surface()
-        self.font = pygame.font.Font(None, 24)
-        self.title_font = pygame.font.Font(None, 56)
-        self.large_font = pygame.font.Font(None, 32)
-        self.simple_surfs = simple_surfs
+        self.font_size = 24
+        self.title_font_size = 56
+        self.large_font_size = 32
+        self.portraits = portraits  # PortraitCache shared with the battle UI
         
         # All available creatures
         self.all_creatures = list(CREATURE_DATA.keys())
@@ -527,8 +451,12 @@ class CreatureSelection:
         # Animation variables
         self.hover_scale = 1.0
         self.hover_target = 1.0
+        self.hover_max = 1.15
+        self.hover_steps = 8  # Drawn hover scales snap to this many steps, so every portrait size is cached
         self.pulse_timer = 0
         self.float_offset = 0
+        self.background = SELECTION_BACKGROUND
+        self.portraits.warm([self.portrait_size(self.step_scale(step)) for step in range(self.hover_steps + 1)])
         
         # Color palette for elements
         self.element_colors = {
@@ -541,24 +469,17 @@ class CreatureSelection:
         self.previous_keys = pygame.key.get_pressed()
         self.current_keys = pygame.key.get_pressed()
     
-    def fit_text_to_box(self, text, max_width, font_size=24):
-        """Fit text to a specific width by adjusting font size"""
-        for size in range(font_size, 12, -2):
-            test_font = pygame.font.Font(None, size)
-            text_surf = test_font.render(text, True, (255, 255, 255))
-            if text_surf.get_width() <= max_width:
-                return test_font, text
-        
-        # If still too long, truncate
-        small_font = pygame.font.Font(None, 14)
-        while len(text) > 0:
-            text_surf = small_font.render(text + "...", True, (255, 255, 255))
-            if text_surf.get_width() <= max_width:
-                return small_font, text + "..."
-            text = text[:-1]
-        
-        return small_font, "..."
-    
+    def step_scale(self, step):
+        return 1.0 + (self.hover_max - 1.0) * step / self.hover_steps
+
+    def snap_scale(self, scale):
+        """Nearest of the hover scale steps"""
+        step = round((scale - 1.0) / (self.hover_max - 1.0) * self.hover_steps)
+        return self.step_scale(max(0, min(self.hover_steps, step)))
+
+    def portrait_size(self, scale):
+        return int(self.creature_size * scale) - 10
+
     def handle_input(self):
         """Handle keyboard input for creature selection"""
         # Update key states
@@ -604,14 +525,8 @@ class CreatureSelection:
         self.pulse_timer += 0.02
         self.float_offset += 0.01
         
-        # Create gradient background
-        for y in range(WINDOW_HEIGHT):
-            # Create a smooth gradient from dark blue to dark purple
-            r = int(20 + 10 * math.sin(self.pulse_timer + y * 0.01))
-            g = int(25 + 15 * math.sin(self.pulse_timer * 1.5 + y * 0.01))
-            b = int(60 + 20 * math.sin(self.pulse_timer * 0.8 + y * 0.01))
-            color = (max(0, min(255, r)), max(0, min(255, g)), max(0, min(255, b)))
-            pygame.draw.line(self.display_surface, color, (0, y), (WINDOW_WIDTH, y))
+        # Gradient background, pre-rendered as a loop of frames
+        self.background.draw(self.display_surface, self.pulse_timer)
         
         # Animated title with glow effect
         title_text = "🌟 Choose Your Elemental Team 🌟"
@@ -619,14 +534,14 @@ class CreatureSelection:
         # Draw title shadow/glow
         for offset in [(2, 2), (1, 1), (0, 0)]:
             shadow_color = (100, 50, 150) if offset != (0, 0) else (255, 255, 255)
-            title_surf = self.title_font.render(title_text, True, shadow_color)
+            title_surf = render_text(title_text, self.title_font_size, shadow_color)
             title_rect = title_surf.get_rect(center=(WINDOW_WIDTH // 2 + offset[0], 70 + offset[1]))
             self.display_surface.blit(title_surf, title_rect)
         
         # Animated subtitle
         subtitle_text = "Select 4 Creatures for Battle"
         float_y = 110 + math.sin(self.pulse_timer * 2) * 3
-        subtitle_surf = self.large_font.render(subtitle_text, True, (200, 220, 255))
+        subtitle_surf = render_text(subtitle_text, self.large_font_size, (200, 220, 255))
         subtitle_rect = subtitle_surf.get_rect(center=(WINDOW_WIDTH // 2, float_y))
         self.display_surface.blit(subtitle_surf, subtitle_rect)
         
@@ -634,13 +549,13 @@ class CreatureSelection:
         selected_count = len(self.selected_creatures)
         progress_color = (100, 255, 100) if selected_count == 4 else (255, 200, 100)
         instruction_text = f"🎯 Selected: {selected_count}/4  •  ⌨️ SPACE: Select  •  ✅ C: Confirm"
-        inst_surface = self.font.render(instruction_text, True, progress_color)
+        inst_surface = render_text(instruction_text, self.font_size, progress_color)
         inst_rect = inst_surface.get_rect(center=(WINDOW_WIDTH // 2, 140))
         self.display_surface.blit(inst_surface, inst_rect)
         
         # Update hover animation
         if self.current_index < len(self.all_creatures):
-            self.hover_target = 1.15
+            self.hover_target = self.hover_max
         else:
             self.hover_target = 1.0
         self.hover_scale += (self.hover_target - self.hover_scale) * 0.15
@@ -654,7 +569,7 @@ class CreatureSelection:
             y = self.start_y + row * (self.creature_size + self.spacing * 2)
             
             # Calculate scale and floating effect
-            scale = self.hover_scale if i == self.current_index else 1.0
+            scale = self.snap_scale(self.hover_scale) if i == self.current_index else 1.0
             float_y_offset = math.sin(self.float_offset + i * 0.5) * 2 if i == self.current_index else 0
             
             actual_size = int(self.creature_size * scale)
@@ -667,28 +582,19 @@ class CreatureSelection:
             
             # Draw selection background glow
             if creature_name in self.selected_creatures:
-                glow_size = actual_size + 20
-                glow_surf = pygame.Surface((glow_size, glow_size), pygame.SRCALPHA)
-                pygame.draw.circle(glow_surf, (*element_color, 80), (glow_size//2, glow_size//2), glow_size//2)
+                glow_surf = PANELS.circle(actual_size + 20, element_color, 80)
                 self.display_surface.blit(glow_surf, (actual_x - 10, actual_y - 10))
             
             # Draw main creature background
             bg_rect = pygame.Rect(actual_x, actual_y, actual_size, actual_size)
             
-            # Create gradient background for creature card
-            bg_surf = pygame.Surface((actual_size, actual_size), pygame.SRCALPHA)
-            for py in range(actual_size):
-                alpha = 255 - (py * 100 // actual_size)
-                color = (*element_color, max(50, alpha))
-                pygame.draw.line(bg_surf, color, (0, py), (actual_size, py))
-            
+            # Gradient background for creature card
+            bg_surf = PANELS.gradient((actual_size, actual_size), element_color, 255, 100, min_alpha = 50)
             self.display_surface.blit(bg_surf, (actual_x, actual_y))
             
             # Draw creature image
-            image_key = CREATURE_IMAGE_MAP.get(creature_name, creature_name)
-            if image_key in self.simple_surfs:
-                creature_surf = pygame.transform.scale(self.simple_surfs[image_key], 
-                                                     (actual_size - 10, actual_size - 10))
+            creature_surf = self.portraits.get(creature_name, self.portrait_size(scale))
+            if creature_surf is not None:
                 creature_rect = creature_surf.get_rect(center=bg_rect.center)
                 self.display_surface.blit(creature_surf, creature_rect)
             
@@ -699,7 +605,7 @@ class CreatureSelection:
             
             # Selection indicator
             if creature_name in self.selected_creatures:
-                check_surf = self.large_font.render("✓", True, (255, 255, 255))
+                check_surf = render_text("✓", self.large_font_size, (255, 255, 255))
                 check_rect = check_surf.get_rect(topright=(bg_rect.right - 5, bg_rect.top + 5))
                 # Draw check mark background
                 pygame.draw.circle(self.display_surface, (0, 200, 0), check_rect.center, 15)
@@ -707,20 +613,20 @@ class CreatureSelection:
               # Draw creature name with shadow and text fitting
             name_y = actual_y + actual_size + 8
             name_width = self.creature_size + self.spacing  # Max width for name
-            fitted_font, fitted_name = self.fit_text_to_box(creature_name, name_width, 24)
+            fitted_size, fitted_name = fit_text(creature_name, name_width, self.font_size)
             
             # Shadow
-            name_shadow = fitted_font.render(fitted_name, True, (0, 0, 0))
+            name_shadow = render_text(fitted_name, fitted_size, (0, 0, 0))
             shadow_rect = name_shadow.get_rect(center=(x + self.creature_size // 2 + 1, name_y + 1))
             self.display_surface.blit(name_shadow, shadow_rect)
             # Main text
-            name_surf = fitted_font.render(fitted_name, True, (255, 255, 255))
+            name_surf = render_text(fitted_name, fitted_size, (255, 255, 255))
             name_rect = name_surf.get_rect(center=(x + self.creature_size // 2, name_y))
             self.display_surface.blit(name_surf, name_rect)
             
             # Draw creature stats with element color
             stats_text = f"{creature_data['element'].title()} • {creature_data['health']}HP"
-            stats_surf = pygame.font.Font(None, 18).render(stats_text, True, element_color)
+            stats_surf = render_text(stats_text, 18, element_color)
             stats_rect = stats_surf.get_rect(center=(x + self.creature_size // 2, name_y + 20))
             self.display_surface.blit(stats_surf, stats_rect)
         
@@ -752,6 +658,6 @@ class CreatureSelection:
         if len(self.selected_creatures) == 4:
             progress_text += " - Press C to Confirm!"
         
-        text_surf = self.font.render(progress_text, True, (255, 255, 255))
+        text_surf = render_text(progress_text, self.font_size, (255, 255, 255))
         text_rect = text_surf.get_rect(center=(WINDOW_WIDTH // 2, bar_y + bar_height + 15))
         self.display_surface.blit(text_surf, text_rect)
\ No newline at end of file